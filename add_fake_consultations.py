@@ -1,189 +1,257 @@
+import argparse
 import sqlite3
-from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 import random
+from collections import Counter
 
-def debug_print_db():
+# Fixed seed so repeated runs produce the same fixture data
+RANDOM_SEED = 0
+
+DOCTORS_DB = "data/doctors.db"
+USERS_DB = "data/users.db"
+FIXTURE_SQL = "data/fake_consultations.sql"
+
+# Consultation types and statuses
+CONSULTATION_TYPES = ('Video Consultation', 'Chat Consultation', 'In-Person', 'Emergency Consultation')
+STATUSES = ('pending', 'confirmed', 'completed', 'cancelled')
+
+# Medical conditions and notes
+MEDICAL_CONDITIONS = (
+    'Chest pain and shortness of breath',
+    'High blood pressure management',
+    'Heart disease risk assessment',
+    'Regular cardiovascular check-up',
+    'Family history of heart disease',
+    'Post-heart attack follow-up',
+    'Arrhythmia symptoms',
+    'Cholesterol management',
+    'Diabetes and heart health',
+    'Stress-related heart symptoms',
+    'Exercise-induced chest discomfort',
+    'Heart valve disorder monitoring',
+    'Cardiac rehabilitation consultation',
+    'Preventive cardiology assessment',
+    'Heart failure management'
+)
+
+# Every quarter-hour slot from 9 AM to 6 PM
+TIME_TABLE = tuple(f"{h:02d}:{m:02d}:00" for h in range(9, 19) for m in (0, 15, 30, 45))
+
+# Rows per multi-row INSERT statement
+INSERT_BATCH_SIZE = 50
+
+def build_insert_sql(row_count):
+    """Build a multi-row INSERT for row_count consultations"""
+    placeholders = ', '.join(['(?, ?, ?, ?, ?, ?, ?)'] * row_count)
+    return f'''
+        INSERT INTO consultations (
+            doctor_id, patient_id, consultation_type, consultation_date,
+            consultation_time, status, notes
+        ) VALUES {placeholders}
+    '''
+
+# Built once so full batches reuse the same statement text (and sqlite3's statement cache)
+INSERT_SQL = build_insert_sql(INSERT_BATCH_SIZE)
+
+# WAL journaling with relaxed syncing for bulk fixture loading
+SQLITE_PRAGMAS = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+'''
+
+def connect_db():
+    """Open the doctors database with the users database attached as usersdb"""
+    # Autocommit mode: no implicit BEGINs, transactions are opened explicitly with BEGIN IMMEDIATE
+    conn = sqlite3.connect(DOCTORS_DB, isolation_level=None)
+    conn.execute('ATTACH DATABASE ? AS usersdb', (USERS_DB,))
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+def debug_print_db(conn):
     print('--- Database Debug Info ---')
-    # Doctors
-    conn = sqlite3.connect('data/doctors.db')
     c = conn.cursor()
-    c.execute('SELECT id, name FROM doctors')
-    doctors = c.fetchall()
-    print(f'Doctors ({len(doctors)}):', [d[0] for d in doctors[:3]])
-    c.execute('SELECT COUNT(*) FROM consultations')
-    print('Consultations:', c.fetchone()[0])
-    conn.close()
+    c.execute('''
+        SELECT 'doctors', COUNT(*) FROM doctors
+        UNION ALL SELECT 'consultations', COUNT(*) FROM consultations
+        UNION ALL SELECT 'patients', COUNT(*) FROM usersdb.users WHERE role = 'patient'
+    ''')
+    counts = dict(c.fetchall())
+    # Doctors
+    c.execute('SELECT id FROM doctors LIMIT 3')
+    print(f"Doctors ({counts['doctors']}):", [row[0] for row in c.fetchall()])
+    print('Consultations:', counts['consultations'])
     # Patients
-    conn = sqlite3.connect('data/users.db')
-    c = conn.cursor()
-    c.execute('SELECT id, username FROM users WHERE role = "patient"')
-    patients = c.fetchall()
-    print(f'Patients ({len(patients)}):', [p[0] for p in patients[:3]])
-    conn.close()
+    c.execute("SELECT id FROM usersdb.users WHERE role = 'patient' LIMIT 3")
+    print(f"Patients ({counts['patients']}):", [row[0] for row in c.fetchall()])
     print('--------------------------')
 
-def add_fake_consultations():
+def get_fixture_ids(cursor):
+    """Return the doctor and patient ids fake consultations are drawn from"""
+    # Get some doctors
+    cursor.execute('SELECT id FROM doctors LIMIT 10')
+    doctor_ids = [row[0] for row in cursor.fetchall()]
+    
+    # Get users from users database
+    cursor.execute("SELECT id FROM usersdb.users WHERE role = 'patient' LIMIT 15")
+    patient_ids = [row[0] for row in cursor.fetchall()]
+    return doctor_ids, patient_ids
+
+def fixture_dates():
+    """Return ISO dates for the next 30 days"""
+    base_date = date.today()
+    return tuple((base_date + timedelta(days=i)).isoformat() for i in range(30))
+
+def generate_consultation_batches(doctor_ids, patient_ids, dates, count):
+    """Yield fake consultation rows in INSERT_BATCH_SIZE batches, sampling each column in one call"""
+    for start in range(0, count, INSERT_BATCH_SIZE):
+        k = min(INSERT_BATCH_SIZE, count - start)
+        yield list(zip(
+            random.choices(doctor_ids, k=k),
+            random.choices(patient_ids, k=k),
+            random.choices(CONSULTATION_TYPES, k=k),
+            random.choices(dates, k=k),
+            random.choices(TIME_TABLE, k=k),
+            random.choices(STATUSES, k=k),
+            random.choices(MEDICAL_CONDITIONS, k=k),
+        ))
+
+def add_fake_consultations(conn, count=50, seed=RANDOM_SEED, vacuum=False, keep_existing=False):
     """Add fake consultations for testing"""
     try:
-        # Connect to doctors database
-        doctors_db = Path("data/doctors.db")
-        conn = sqlite3.connect(str(doctors_db))
+        random.seed(seed)
         cursor = conn.cursor()
         
-        # Get some doctors
-        cursor.execute('SELECT id FROM doctors LIMIT 10')
-        doctor_ids = [row[0] for row in cursor.fetchall()]
-        print('Doctor IDs:', doctor_ids)
+        # Lets the recent consultations query walk the index instead of sorting the table
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cons_date_time
+            ON consultations(consultation_date, consultation_time)
+        ''')
         
-        # Get users from users database
-        users_conn = sqlite3.connect("data/users.db")
-        users_cursor = users_conn.cursor()
-        users_cursor.execute('SELECT id FROM users WHERE role = "patient" LIMIT 15')
-        patient_ids = [row[0] for row in users_cursor.fetchall()]
-        users_conn.close()
+        doctor_ids, patient_ids = get_fixture_ids(cursor)
+        print('Doctor IDs:', doctor_ids)
         print('Patient IDs:', patient_ids)
         
         if doctor_ids and patient_ids:
-            # Generate dates for the next 30 days
-            base_date = datetime.now()
-            dates = [(base_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(30)]
+            dates = fixture_dates()
             
-            # Consultation types and statuses
-            consultation_types = ['Video Consultation', 'Chat Consultation', 'In-Person', 'Emergency Consultation']
-            statuses = ['pending', 'confirmed', 'completed', 'cancelled']
-            
-            # Medical conditions and notes
-            medical_conditions = [
-                'Chest pain and shortness of breath',
-                'High blood pressure management',
-                'Heart disease risk assessment',
-                'Regular cardiovascular check-up',
-                'Family history of heart disease',
-                'Post-heart attack follow-up',
-                'Arrhythmia symptoms',
-                'Cholesterol management',
-                'Diabetes and heart health',
-                'Stress-related heart symptoms',
-                'Exercise-induced chest discomfort',
-                'Heart valve disorder monitoring',
-                'Cardiac rehabilitation consultation',
-                'Preventive cardiology assessment',
-                'Heart failure management'
-            ]
-            
-            fake_consultations = []
-            
-            # Generate 50 fake consultations
-            for i in range(50):
-                doctor_id = random.choice(doctor_ids)
-                patient_id = random.choice(patient_ids)
-                consultation_type = random.choice(consultation_types)
-                status = random.choice(statuses)
-                date = random.choice(dates)
-                time_hour = random.randint(9, 18)  # 9 AM to 6 PM
-                time_minute = random.choice([0, 15, 30, 45])
-                consultation_time = f"{time_hour:02d}:{time_minute:02d}:00"
-                notes = random.choice(medical_conditions)
+            # Clear and re-insert in a single transaction (one commit instead of one per row)
+            added = 0
+            status_counts = Counter()
+            type_counts = Counter()
+            with conn:
+                cursor.execute('BEGIN IMMEDIATE')
                 
-                fake_consultations.append({
-                    'doctor_id': doctor_id,
-                    'patient_id': patient_id,
-                    'consultation_type': consultation_type,
-                    'consultation_date': date,
-                    'consultation_time': consultation_time,
-                    'status': status,
-                    'notes': notes
-                })
-            
-            # Clear existing consultations (optional - comment out if you want to keep existing ones)
-            cursor.execute('DELETE FROM consultations')
+                # Clear existing consultations (pass keep_existing=True to keep them)
+                if not keep_existing:
+                    cursor.execute('DELETE FROM consultations')
+                
+                # Insert new consultations as multi-row VALUES statements,
+                # INSERT_BATCH_SIZE rows at a time (7 params each, well under SQLite's 999 limit)
+                for batch in generate_consultation_batches(doctor_ids, patient_ids, dates, count):
+                    sql = INSERT_SQL if len(batch) == INSERT_BATCH_SIZE else build_insert_sql(len(batch))
+                    cursor.execute(sql, [value for row in batch for value in row])
+                    added += len(batch)
+                    status_counts.update(row[5] for row in batch)
+                    type_counts.update(row[2] for row in batch)
             
-            # Insert new consultations
-            for consultation in fake_consultations:
-                cursor.execute('''
-                    INSERT INTO consultations (
-                        doctor_id, patient_id, consultation_type, consultation_date,
-                        consultation_time, status, notes
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    consultation['doctor_id'], consultation['patient_id'],
-                    consultation['consultation_type'], consultation['consultation_date'],
-                    consultation['consultation_time'], consultation['status'],
-                    consultation['notes']
-                ))
+            # Reclaim pages freed by the DELETE (VACUUM cannot run inside a transaction)
+            if vacuum:
+                conn.execute('VACUUM')
             
-            conn.commit()
             print("✅ Fake consultations added successfully!")
-            print(f"Added {len(fake_consultations)} consultations")
+            print(f"Added {added} consultations")
+            
+            # Show summary statistics; when the table was cleared the generated rows are all there is
+            if keep_existing:
+                status_counts = Counter()
+                type_counts = Counter()
+                cursor.execute('''
+                    SELECT status, consultation_type, COUNT(*)
+                    FROM consultations
+                    GROUP BY status, consultation_type
+                ''')
+                for status, consult_type, total in cursor.fetchall():
+                    status_counts[status] += total
+                    type_counts[consult_type] += total
             
-            # Show summary statistics
-            cursor.execute('SELECT status, COUNT(*) FROM consultations GROUP BY status')
-            status_counts = cursor.fetchall()
             print("\n📊 Consultation Status Summary:")
-            for status, count in status_counts:
-                print(f"- {status.capitalize()}: {count}")
+            for status, total in sorted(status_counts.items()):
+                print(f"- {status.capitalize()}: {total}")
             
-            cursor.execute('SELECT consultation_type, COUNT(*) FROM consultations GROUP BY consultation_type')
-            type_counts = cursor.fetchall()
             print("\n📋 Consultation Type Summary:")
-            for consult_type, count in type_counts:
-                print(f"- {consult_type}: {count}")
+            for consult_type, total in sorted(type_counts.items()):
+                print(f"- {consult_type}: {total}")
             
-            # Show some recent consultations
-            try:
-                # First get consultations from doctors database
-                cursor.execute('''
-                    SELECT c.*, d.name as doctor_name
-                    FROM consultations c
-                    JOIN doctors d ON c.doctor_id = d.id
-                    ORDER BY c.consultation_date DESC, c.consultation_time DESC
-                    LIMIT 10
-                ''')
-                
-                consultations = cursor.fetchall()
-                
-                # Now get patient names from users database
-                users_conn = sqlite3.connect("data/users.db")
-                users_cursor = users_conn.cursor()
-                
-                print("\n📋 Recent Consultations:")
-                for consultation in consultations:
-                    # Get patient name from users database
-                    users_cursor.execute('SELECT username FROM users WHERE id = ?', (consultation[2],))  # consultation[2] is patient_id
-                    user_result = users_cursor.fetchone()
-                    patient_name = user_result[0] if user_result else f"Patient ID {consultation[2]}"
-                    
-                    # Use correct indices based on table structure
-                    print(f"- Dr. {consultation[9]} with {patient_name} on {consultation[4]} at {consultation[5]} ({consultation[6]}) - {consultation[7]}")
-                
-                users_conn.close()
-                
-            except Exception as e:
-                print(f"\n⚠️ Could not show detailed consultations: {e}")
-                # Show consultations without patient names
-                cursor.execute('''
-                    SELECT c.*, d.name as doctor_name
-                    FROM consultations c
-                    JOIN doctors d ON c.doctor_id = d.id
-                    ORDER BY c.consultation_date DESC, c.consultation_time DESC
-                    LIMIT 10
-                ''')
-                
-                consultations = cursor.fetchall()
-                print("\n📋 Recent Consultations:")
-                for consultation in consultations:
-                    print(f"- Dr. {consultation[9]} with Patient ID {consultation[2]} on {consultation[4]} at {consultation[5]} ({consultation[6]}) - {consultation[7]}")
+            # Show some recent consultations, joining patient names from users database
+            cursor.execute('''
+                SELECT d.name, COALESCE(u.username, 'Patient ID ' || c.patient_id),
+                       c.consultation_date, c.consultation_time, c.consultation_type, c.status
+                FROM consultations c
+                JOIN doctors d ON c.doctor_id = d.id
+                LEFT JOIN usersdb.users u ON c.patient_id = u.id
+                ORDER BY c.consultation_date DESC, c.consultation_time DESC
+                LIMIT 10
+            ''')
+            
+            print("\n📋 Recent Consultations:")
+            for doctor_name, patient_name, consult_date, consult_time, consult_type, status in cursor.fetchall():
+                print(f"- Dr. {doctor_name} with {patient_name} on {consult_date} at {consult_time} ({consult_type}) - {status}")
         else:
             print("❌ No doctors or patients found in database")
         
-        conn.close()
-        
     except Exception as e:
         print(f"❌ Error adding fake consultations: {e}")
         import traceback
         traceback.print_exc()
 
+def sql_literal(value):
+    """Render an int or str as a SQL literal"""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+def dump_fake_consultations(conn, path=FIXTURE_SQL, count=50, seed=RANDOM_SEED):
+    """Write generated fake consultations to a SQL script for load_fake_consultations"""
+    random.seed(seed)
+    doctor_ids, patient_ids = get_fixture_ids(conn.cursor())
+    if not (doctor_ids and patient_ids):
+        print("❌ No doctors or patients found in database")
+        return
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('DELETE FROM consultations;\n')
+        for batch in generate_consultation_batches(doctor_ids, patient_ids, fixture_dates(), count):
+            values = ',\n'.join('(' + ', '.join(sql_literal(v) for v in row) + ')' for row in batch)
+            f.write(
+                'INSERT INTO consultations (doctor_id, patient_id, consultation_type, consultation_date, '
+                f'consultation_time, status, notes) VALUES\n{values};\n'
+            )
+    print(f"✅ Wrote {count} fake consultations to {path}")
+
+def load_fake_consultations(conn, path=FIXTURE_SQL):
+    """Replace consultations with the rows from a dump_fake_consultations script"""
+    with open(path, encoding='utf-8') as f:
+        script = f.read()
+    conn.executescript(f'BEGIN;\n{script}\nCOMMIT;')
+    print(f"✅ Loaded fake consultations from {path}")
+
 if __name__ == "__main__":
-    debug_print_db()
-    add_fake_consultations() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Add fake consultations for testing")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--dump', action='store_true', help=f"write generated consultations to {FIXTURE_SQL}")
+    mode.add_argument('--load', action='store_true', help=f"load consultations from {FIXTURE_SQL}")
+    args = parser.parse_args()
+    
+    conn = connect_db()
+    try:
+        if args.dump:
+            dump_fake_consultations(conn)
+        elif args.load:
+            load_fake_consultations(conn)
+        else:
+            debug_print_db(conn)
+            add_fake_consultations(conn)
+    finally:
+        conn.close()
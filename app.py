@@ -1,11 +1,8 @@
 import streamlit as st
-import os
 from pathlib import Path
 import sys
-import json
 from datetime import datetime
-import pandas as pd
-import sqlite3
+import importlib.util
 
 # Add the project root to the Python path for imports
 project_root = Path(__file__).parent
@@ -14,48 +11,24 @@ sys.path.append(str(project_root))
 # Import authentication system
 from components.login_auth import render_login_page, check_authentication, logout_user, is_doctor, is_patient
 
-# Import new features
-try:
-    from components.doctor_registry import render_doctor_registration, render_doctor_search, render_doctor_details
-    DOCTOR_REGISTRY_AVAILABLE = True
-except ImportError:
-    DOCTOR_REGISTRY_AVAILABLE = False
+def module_available(name):
+    """Check whether a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
 
-try:
-    from reports.pdf_generator import render_pdf_generator
-    PDF_GENERATOR_AVAILABLE = True
-except ImportError:
-    PDF_GENERATOR_AVAILABLE = False
+# Optional features (imported on first visit to the page that uses them)
+DOCTOR_REGISTRY_AVAILABLE = module_available("components.doctor_registry")
+PDF_GENERATOR_AVAILABLE = module_available("reports.pdf_generator")
 
-# Import prediction module
-try:
-    from utils.predict import HeartDiseasePredictor
-    PREDICTOR_AVAILABLE = True
-except ImportError as e:
-    PREDICTOR_AVAILABLE = False
-    print(f"Predictor not available: {e}")
+# Prediction module (imported on first use; it pulls in numpy/pandas/sklearn)
+PREDICTOR_AVAILABLE = module_available("utils.predict")
+if not PREDICTOR_AVAILABLE:
+    print("Predictor not available: utils.predict not found")
 
-def main():
-    """
-    Main entry point for the Heart Disease Prediction Streamlit application.
-    Unified application with modern UI, header, footer, and all features.
-    """
-    
-    # Page configuration
-    st.set_page_config(
-        page_title="Heart Disease Detector - AI-Powered Cardiovascular Risk Assessment",
-        page_icon="❤️",
-        layout="wide",
-        initial_sidebar_state="collapsed"
-    )
-    
-    # If not authenticated, show login page and stop
-    if not check_authentication():
-        render_login_page()
-        st.stop()
-    
-    # Custom CSS for modern UI
-    st.markdown("""
+# Custom CSS for modern UI (built once at import, emitted on every rerun)
+APP_CSS = """
         <style>
         /* Modern CSS Reset and Base Styles */
         * {
@@ -334,7 +307,178 @@ def main():
         footer {visibility: hidden;}
         header {visibility: hidden;}
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+# Static header markup
+HEADER_HTML = """
+        <div class="header">
+            <div class="header-content">
+                <div class="logo-section">
+                    <span style="font-size: 2rem;">❤️</span>
+                    <span class="logo-text">HeartCare Pro</span>
+                </div>
+                <nav>
+                    <ul class="nav-menu">
+                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'home'}, '*')">Home</a></li>
+                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'patient'}, '*')">Patient Mode</a></li>
+                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'doctor'}, '*')">Doctor Mode</a></li>
+                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'about'}, '*')">About</a></li>
+                    </ul>
+                </nav>
+                <div class="profile-icon" title="Profile" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'profile'}, '*')">👤</div>
+            </div>
+        </div>
+    """
+
+# Home page copy, pre-rendered to HTML so it skips the markdown parser
+FEATURES_HTML = """
+<ul>
+    <li><strong>AI Risk Assessment</strong>: Get instant heart disease risk predictions</li>
+    <li><strong>Doctor Directory</strong>: Find qualified healthcare professionals</li>
+    <li><strong>Consultation Booking</strong>: Schedule appointments with doctors</li>
+    <li><strong>Chat Support</strong>: Real-time communication with healthcare providers</li>
+    <li><strong>PDF Reports</strong>: Generate detailed health reports</li>
+    <li><strong>Batch Analysis</strong>: Professional tools for healthcare providers</li>
+</ul>
+"""
+
+USER_GROUPS_HTML = """
+<p><strong>👤 Patients:</strong></p>
+<ul>
+    <li>Heart disease risk assessment</li>
+    <li>Find and book doctors</li>
+    <li>Chat with healthcare providers</li>
+    <li>Generate health reports</li>
+</ul>
+<p><strong>👨‍⚕️ Doctors:</strong></p>
+<ul>
+    <li>Patient consultation management</li>
+    <li>Batch patient analysis</li>
+    <li>Professional profile registration</li>
+    <li>Patient communication tools</li>
+</ul>
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <div class="footer-content">
+        <div class="footer-section">
+            <h3>Heart Disease Detector</h3>
+            <p>AI-powered cardiovascular health assessment platform designed to help individuals and healthcare professionals make informed decisions about heart health.</p>
+        </div>
+        <div class="footer-section">
+            <h3>Quick Links</h3>
+            <p><a href="#">Home</a></p>
+            <p><a href="#">Patient Assessment</a></p>
+            <p><a href="#">Doctor Mode</a></p>
+            <p><a href="#">Find Doctors</a></p>
+            <p><a href="#">Generate Reports</a></p>
+            <p><a href="#">About</a></p>
+        </div>
+        <div class="footer-section">
+            <h3>Resources</h3>
+            <p><a href="#">Health Guidelines</a></p>
+            <p><a href="#">Research Papers</a></p>
+            <p><a href="#">Medical References</a></p>
+            <p><a href="#">FAQ</a></p>
+        </div>
+        <div class="footer-section">
+            <h3>Legal</h3>
+            <p><a href="#">Privacy Policy</a></p>
+            <p><a href="#">Terms of Service</a></p>
+            <p><a href="#">Medical Disclaimer</a></p>
+            <p><a href="#">Cookie Policy</a></p>
+        </div>
+    </div>
+    <div class="footer-bottom">
+        <p>&copy; 2024 Heart Disease Detector. All rights reserved. | Made with ❤️ for better heart health</p>
+    </div>
+</div>
+"""
+
+# Column dtypes for batch CSV uploads (the model's 13 input features)
+BATCH_FEATURE_DTYPES = {
+    'age': 'float32', 'sex': 'float32', 'cp': 'float32', 'trestbps': 'float32',
+    'chol': 'float32', 'fbs': 'float32', 'restecg': 'float32', 'thalach': 'float32',
+    'exang': 'float32', 'oldpeak': 'float64', 'slope': 'float32', 'ca': 'float32',
+    'thal': 'float32'
+}
+
+# Assessment recommendations by risk band
+LOW_RISK_RECOMMENDATIONS = """
+**Keep up the good work!** 
+- Continue maintaining a healthy lifestyle
+- Regular check-ups with your doctor
+- Monitor your health metrics regularly
+"""
+MODERATE_RISK_RECOMMENDATIONS = """
+**Moderate risk detected. Consider:**
+- Consulting with a healthcare provider
+- Lifestyle modifications (diet, exercise)
+- Regular monitoring of heart health
+- Stress management techniques
+"""
+HIGH_RISK_RECOMMENDATIONS = """
+**High risk detected. Please:**
+- **Immediately consult a healthcare provider**
+- Consider lifestyle changes
+- Regular medical monitoring
+- Follow medical advice strictly
+"""
+
+# Risk level (as returned by get_risk_level) -> (banner element, icon, recommendation element, text)
+RISK_UI = {
+    "Low Risk": (st.success, "🟢", st.info, LOW_RISK_RECOMMENDATIONS),
+    "Moderate Risk": (st.warning, "🟡", st.warning, MODERATE_RISK_RECOMMENDATIONS),
+    "High Risk": (st.error, "🔴", st.error, HIGH_RISK_RECOMMENDATIONS),
+    "Very High Risk": (st.error, "🔴", st.error, HIGH_RISK_RECOMMENDATIONS),
+}
+
+# Assessment form options; each option's position is the model's encoded value
+CP_OPTIONS = ("Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic")
+RESTECG_OPTIONS = ("Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy")
+SLOPE_OPTIONS = ("Upsloping", "Flat", "Downsloping")
+THAL_OPTIONS = ("Normal", "Fixed Defect", "Reversable Defect")
+CP_IDX = {option: i for i, option in enumerate(CP_OPTIONS)}
+RESTECG_IDX = {option: i for i, option in enumerate(RESTECG_OPTIONS)}
+SLOPE_IDX = {option: i for i, option in enumerate(SLOPE_OPTIONS)}
+THAL_IDX = {option: i for i, option in enumerate(THAL_OPTIONS)}
+
+# Consultation status indicators
+STATUS_ICON = {
+    'pending': '🟡',
+    'confirmed': '🟢',
+    'completed': '🔵',
+    'cancelled': '🔴'
+}
+
+@st.cache_resource
+def get_predictor():
+    """Load the prediction model once and share it across reruns and sessions"""
+    from utils.predict import HeartDiseasePredictor
+    return HeartDiseasePredictor()
+
+def main():
+    """
+    Main entry point for the Heart Disease Prediction Streamlit application.
+    Unified application with modern UI, header, footer, and all features.
+    """
+    
+    # Page configuration
+    st.set_page_config(
+        page_title="Heart Disease Detector - AI-Powered Cardiovascular Risk Assessment",
+        page_icon="❤️",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+    
+    # If not authenticated, show login page and stop
+    if not check_authentication():
+        render_login_page()
+        st.stop()
+    
+    # Custom CSS for modern UI
+    st.markdown(APP_CSS, unsafe_allow_html=True)
     
     # Initialize session state
     if "current_page" not in st.session_state:
@@ -342,21 +486,27 @@ def main():
     if "user_mode" not in st.session_state:
         st.session_state.user_mode = None
     
+    # Resolve the user's role once for this run
+    user_role = get_user_role_cached()
+    
     # Render Header
-    render_header()
+    render_header(user_role)
     
     # Render Main Content based on current page
     if st.session_state.current_page == "home":
         render_home_page()
     elif st.session_state.current_page == "patient":
-        render_patient_page()
+        render_patient_page(user_role)
     elif st.session_state.current_page == "doctor":
-        render_doctor_page()
-    elif st.session_state.current_page == "doctor_search" and DOCTOR_REGISTRY_AVAILABLE and is_patient():
+        render_doctor_page(user_role)
+    elif st.session_state.current_page == "doctor_search" and DOCTOR_REGISTRY_AVAILABLE and user_role == "patient":
+        from components.doctor_registry import render_doctor_search
         render_doctor_search()
-    elif st.session_state.current_page == "doctor_registration" and DOCTOR_REGISTRY_AVAILABLE and is_doctor():
+    elif st.session_state.current_page == "doctor_registration" and DOCTOR_REGISTRY_AVAILABLE and user_role == "doctor":
+        from components.doctor_registry import render_doctor_registration
         render_doctor_registration()
     elif st.session_state.current_page == "pdf_generator" and PDF_GENERATOR_AVAILABLE:
+        from reports.pdf_generator import render_pdf_generator
         render_pdf_generator()
     elif st.session_state.current_page == "about":
         render_about_page()
@@ -373,100 +523,86 @@ def main():
     # Render Footer
     render_footer()
 
-def render_header():
-    """Render the modern header with role-based navigation"""
-    st.markdown("""
-        <div class="header">
-            <div class="header-content">
-                <div class="logo-section">
-                    <span style="font-size: 2rem;">❤️</span>
-                    <span class="logo-text">HeartCare Pro</span>
-                </div>
-                <nav>
-                    <ul class="nav-menu">
-                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'home'}, '*')">Home</a></li>
-                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'patient'}, '*')">Patient Mode</a></li>
-                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'doctor'}, '*')">Doctor Mode</a></li>
-                        <li><a href="#" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'about'}, '*')">About</a></li>
-                    </ul>
-                </nav>
-                <div class="profile-icon" title="Profile" onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'profile'}, '*')">👤</div>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+def get_user_role_cached():
+    """Return the current user's role, resolved once per logged-in user"""
+    user_id = st.session_state.get('user_data', {}).get('user_id')
+    cached = st.session_state.get('_role_cache')
+    if cached and cached[0] == user_id:
+        return cached[1]
     
-    # Role-based navigation buttons
-    user_role = "doctor" if is_doctor() else "patient"
+    role = "doctor" if is_doctor() else ("patient" if is_patient() else None)
+    st.session_state['_role_cache'] = (user_id, role)
+    return role
+
+def navigate_to(page):
+    """Switch to another page, rerunning the whole app only if the page changes"""
+    if st.session_state.current_page != page:
+        st.session_state.current_page = page
+        st.rerun(scope="app")
+
+def render_header(user_role):
+    """Render the modern header with role-based navigation"""
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
     
+    render_nav(user_role)
+
+@st.fragment
+def render_nav(user_role):
+    """Role-based navigation buttons; clicks rerun only this fragment unless the page changes"""
     col1, col2, col3, col4, col5, col6 = st.columns([1, 1, 1, 1, 1, 1])
     
     with col1:
         if st.button("🏠 Home", use_container_width=True):
-            st.session_state.current_page = "home"
-            st.rerun()
+            navigate_to("home")
     
     with col2:
         if st.button("👤 Patient", use_container_width=True):
-            st.session_state.current_page = "patient"
-            st.rerun()
+            navigate_to("patient")
     
     with col3:
         if st.button("👨‍⚕️ Doctor", use_container_width=True):
-            st.session_state.current_page = "doctor"
-            st.rerun()
+            navigate_to("doctor")
     
     with col4:
         # Show "Find Doctors" only for patients
-        if is_patient():
+        if user_role == "patient":
             if st.button("🔍 Find Doctors", use_container_width=True):
                 if DOCTOR_REGISTRY_AVAILABLE:
-                    st.session_state.current_page = "doctor_search"
-                    st.rerun()
+                    navigate_to("doctor_search")
                 else:
                     st.error("Doctor registry feature not available")
         else:
             # Show "My Profile" for registered doctors, "Register" for unregistered doctors
             if DOCTOR_REGISTRY_AVAILABLE:
-                from components.doctor_registry import DoctorRegistry
-                registry = DoctorRegistry()
+                from components.doctor_registry import get_registry, is_registered_doctor
+                registry = get_registry()
                 
                 # Check if user is a registered doctor
                 if 'user_data' in st.session_state:
-                    conn = sqlite3.connect(str(registry.db_path))
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT id FROM doctors WHERE user_id = ?', (st.session_state.user_data['user_id'],))
-                    doctor = cursor.fetchone()
-                    conn.close()
-                    
-                    if doctor:
+                    if is_registered_doctor(st.session_state.user_data['user_id'], str(registry.db_path)):
                         # Doctor is registered, show "My Profile"
                         if st.button("👤 My Profile", use_container_width=True):
-                            st.session_state.current_page = "doctor"
-                            st.rerun()
+                            navigate_to("doctor")
                     else:
                         # Doctor is not registered, show "Register"
                         if st.button("📝 Register", use_container_width=True):
-                            st.session_state.current_page = "doctor_registration"
-                            st.rerun()
+                            navigate_to("doctor_registration")
                 else:
                     if st.button("📝 Register", use_container_width=True):
-                        st.session_state.current_page = "doctor_registration"
-                        st.rerun()
+                        navigate_to("doctor_registration")
             else:
                 st.error("Doctor registry feature not available")
     
     with col5:
         if st.button("📄 Reports", use_container_width=True):
             if PDF_GENERATOR_AVAILABLE:
-                st.session_state.current_page = "pdf_generator"
-                st.rerun()
+                navigate_to("pdf_generator")
             else:
                 st.error("PDF generator feature not available")
     
     with col6:
         if st.button("ℹ️ About", use_container_width=True):
-            st.session_state.current_page = "about"
-            st.rerun()
+            navigate_to("about")
 
 def render_home_page():
     """Render the home page with welcome message and features"""
@@ -478,41 +614,21 @@ def render_home_page():
     
     with col1:
         st.markdown("### 🔍 Key Features")
-        st.markdown("""
-        - **AI Risk Assessment**: Get instant heart disease risk predictions
-        - **Doctor Directory**: Find qualified healthcare professionals
-        - **Consultation Booking**: Schedule appointments with doctors
-        - **Chat Support**: Real-time communication with healthcare providers
-        - **PDF Reports**: Generate detailed health reports
-        - **Batch Analysis**: Professional tools for healthcare providers
-        """)
+        st.html(FEATURES_HTML)
     
     with col2:
         st.markdown("### 👥 For Different Users")
-        st.markdown("""
-        **👤 Patients:**
-        - Heart disease risk assessment
-        - Find and book doctors
-        - Chat with healthcare providers
-        - Generate health reports
-        
-        **👨‍⚕️ Doctors:**
-        - Patient consultation management
-        - Batch patient analysis
-        - Professional profile registration
-        - Patient communication tools
-        """)
+        st.html(USER_GROUPS_HTML)
     
-    # AI Chatbot
+    # AI Chatbot (the chatbot module is only imported once the user opens it)
     st.markdown("### 🤖 AI Health Assistant")
-    from components.chatbot import render_ai_chatbot
-    render_ai_chatbot()
+    if st.toggle("Open AI Health Assistant", key="show_ai_chatbot"):
+        from components.chatbot import render_ai_chatbot
+        render_ai_chatbot()
 
-def render_patient_page():
+def render_patient_page(user_role):
     """Render the patient dashboard and assessment page"""
-    from components.login_auth import is_patient
-    
-    if not is_patient():
+    if user_role != "patient":
         st.error("❌ Access Denied: Only patients can access this page.")
         return
     
@@ -529,6 +645,7 @@ def render_patient_page():
     
     with tab3:
         if DOCTOR_REGISTRY_AVAILABLE:
+            from components.doctor_registry import render_doctor_search
             render_doctor_search()
         else:
             st.error("Doctor registry feature not available")
@@ -544,8 +661,7 @@ def render_heart_assessment():
     
     # Initialize predictor
     try:
-        predictor = HeartDiseasePredictor()
-        st.success("✅ AI Model loaded successfully!")
+        predictor = get_predictor()
     except Exception as e:
         st.error(f"❌ Error loading AI model: {str(e)}")
         return
@@ -558,8 +674,7 @@ def render_heart_assessment():
         with col1:
             age = st.slider("Age", 18, 100, 45, help="Your current age")
             sex = st.selectbox("Sex", ["Male", "Female"], help="Your biological sex")
-            chest_pain = st.selectbox("Chest Pain Type", 
-                ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"],
+            chest_pain = st.selectbox("Chest Pain Type", CP_OPTIONS,
                 help="Type of chest pain if experienced")
         
         with col2:
@@ -571,8 +686,7 @@ def render_heart_assessment():
         col1, col2 = st.columns(2)
         
         with col1:
-            resting_ecg = st.selectbox("Resting ECG Results", 
-                ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"],
+            resting_ecg = st.selectbox("Resting ECG Results", RESTECG_OPTIONS,
                 help="Results of resting electrocardiogram")
             max_hr = st.slider("Maximum Heart Rate", 60, 202, 150, help="Maximum heart rate achieved")
         
@@ -586,12 +700,12 @@ def render_heart_assessment():
         
         with col1:
             slope = st.selectbox("Slope of Peak Exercise ST Segment", 
-                ["Upsloping", "Flat", "Downsloping"], help="Slope of the peak exercise ST segment")
+                SLOPE_OPTIONS, help="Slope of the peak exercise ST segment")
             ca = st.slider("Number of Major Vessels", 0, 4, 0, help="Number of major vessels colored by fluoroscopy")
         
         with col2:
             thal = st.selectbox("Thalassemia", 
-                ["Normal", "Fixed Defect", "Reversable Defect"], help="Thalassemia type")
+                THAL_OPTIONS, help="Thalassemia type")
         
         # Submit button
         submitted = st.form_submit_button("🔍 Get Risk Assessment", type="primary")
@@ -605,17 +719,17 @@ def render_heart_assessment():
                 input_data = {
                     'age': age,
                     'sex': 1 if sex == "Male" else 0,
-                    'cp': ["Typical Angina", "Atypical Angina", "Non-anginal Pain", "Asymptomatic"].index(chest_pain),
+                    'cp': CP_IDX[chest_pain],
                     'trestbps': resting_bp,
                     'chol': cholesterol,
                     'fbs': 1 if fasting_bs == "Yes" else 0,
-                    'restecg': ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"].index(resting_ecg),
+                    'restecg': RESTECG_IDX[resting_ecg],
                     'thalach': max_hr,
                     'exang': 1 if exercise_angina == "Yes" else 0,
                     'oldpeak': st_depression,
-                    'slope': ["Upsloping", "Flat", "Downsloping"].index(slope),
+                    'slope': SLOPE_IDX[slope],
                     'ca': ca,
-                    'thal': ["Normal", "Fixed Defect", "Reversable Defect"].index(thal)
+                    'thal': THAL_IDX[thal]
                 }
                 
                 # Get prediction using the correct method name
@@ -633,14 +747,8 @@ def render_heart_assessment():
                 st.markdown("## 📊 Assessment Results")
                 
                 # Risk level display
-                if "Low" in risk_level:
-                    st.success(f"🟢 **Risk Level: {risk_level}**")
-                elif "Moderate" in risk_level:
-                    st.warning(f"🟡 **Risk Level: {risk_level}**")
-                elif "High" in risk_level:
-                    st.error(f"🔴 **Risk Level: {risk_level}**")
-                else:
-                    st.error(f"🔴 **Risk Level: {risk_level}**")
+                banner, icon, show_recommendations, recommendations = RISK_UI.get(risk_level, RISK_UI["Very High Risk"])
+                banner(f"{icon} **Risk Level: {risk_level}**")
                 
                 # Probability gauge
                 st.markdown(f"**Risk Probability: {probability:.1%}**")
@@ -670,29 +778,7 @@ def render_heart_assessment():
                 
                 # Recommendations
                 st.markdown("## 💡 Recommendations")
-                if "Low" in risk_level:
-                    st.info("""
-                    **Keep up the good work!** 
-                    - Continue maintaining a healthy lifestyle
-                    - Regular check-ups with your doctor
-                    - Monitor your health metrics regularly
-                    """)
-                elif "Moderate" in risk_level:
-                    st.warning("""
-                    **Moderate risk detected. Consider:**
-                    - Consulting with a healthcare provider
-                    - Lifestyle modifications (diet, exercise)
-                    - Regular monitoring of heart health
-                    - Stress management techniques
-                    """)
-                else:
-                    st.error("""
-                    **High risk detected. Please:**
-                    - **Immediately consult a healthcare provider**
-                    - Consider lifestyle changes
-                    - Regular medical monitoring
-                    - Follow medical advice strictly
-                    """)
+                show_recommendations(recommendations)
                 
                 # Save to session state
                 st.session_state.last_prediction = {
@@ -713,15 +799,13 @@ def render_heart_assessment():
         with col1:
             if st.button("📄 Generate Report", type="primary"):
                 if PDF_GENERATOR_AVAILABLE:
-                    st.session_state.current_page = "pdf_generator"
-                    st.rerun()
+                    navigate_to("pdf_generator")
                 else:
                     st.error("PDF generator not available")
         with col2:
             if st.button("👨‍⚕️ Find Doctors"):
                 if DOCTOR_REGISTRY_AVAILABLE:
-                    st.session_state.current_page = "doctor_search"
-                    st.rerun()
+                    navigate_to("doctor_search")
                 else:
                     st.error("Doctor registry not available")
         with col3:
@@ -737,61 +821,46 @@ def render_patient_consultations():
         return
     
     if DOCTOR_REGISTRY_AVAILABLE:
-        from components.doctor_registry import DoctorRegistry
-        registry = DoctorRegistry()
+        from components.doctor_registry import get_registry, get_patient_consultations_cached, open_consultation_chat
+        registry = get_registry()
         
         # Get patient consultations
-        consultations = registry.get_patient_consultations(st.session_state.user_data['user_id'])
+        consultations = get_patient_consultations_cached(registry, st.session_state.user_data['user_id'])
         
         if consultations:
-            for consultation in consultations:
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    
-                    with col1:
-                        # consultation[9] is doctor_name, consultation[10] is specialization
-                        doctor_name = consultation[9] if len(consultation) > 9 else "Unknown Doctor"
-                        specialization = consultation[10] if len(consultation) > 10 else "Unknown"
-                        st.markdown(f"**Doctor:** Dr. {doctor_name}")
-                        st.markdown(f"**Specialization:** {specialization}")
-                        st.markdown(f"**Type:** {consultation[3]}")
-                        st.markdown(f"**Date:** {consultation[4]} at {consultation[5]}")
-                        if len(consultation) > 8 and consultation[8]:  # video_call_link
-                            st.markdown(f"**Video Call:** {consultation[8]}")
-                    
-                    with col2:
-                        status_color = {
-                            'pending': '🟡',
-                            'confirmed': '🟢',
-                            'completed': '🔵',
-                            'cancelled': '🔴'
-                        }.get(consultation[6], '⚪')
-                        st.markdown(f"{status_color} {consultation[6].title()}")
-                    
-                    with col3:
-                        if consultation[6] == 'pending':
-                            st.info("Waiting for doctor confirmation")
-                        elif consultation[6] == 'confirmed':
-                            st.success("✅ Confirmed")
-                        elif consultation[6] == 'completed':
-                            st.info("✅ Completed")
-                    
-                    with col4:
-                        if st.button("💬 Chat", key=f"chat_{consultation[0]}"):
-                            st.session_state.chat_consultation = consultation[0]
-                            st.rerun()
-                    
-                    st.divider()
+            import pandas as pd
+            
+            df = pd.DataFrame([{
+                'Doctor': f"Dr. {c['doctor_name'] or 'Unknown Doctor'}",
+                'Specialization': c['specialization'] or "Unknown",
+                'Type': c['consultation_type'],
+                'Date': f"{c['consultation_date']} at {c['consultation_time']}",
+                'Status': f"{STATUS_ICON.get(c['status'], '⚪')} {c['status'].title()}",
+                'Video Call': c['video_call_link']
+            } for c in consultations])
+            st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={'Video Call': st.column_config.LinkColumn('Video Call')}
+            )
+            
+            # Chat with the doctor of a selected consultation
+            labels = {c['id']: f"{doctor} - {date}" for c, doctor, date in zip(consultations, df['Doctor'], df['Date'])}
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                selected = st.selectbox("Consultation", list(labels), format_func=labels.get, label_visibility="collapsed")
+            with col2:
+                st.button("💬 Chat", key="patient_chat", use_container_width=True,
+                          on_click=open_consultation_chat, args=(selected,))
         else:
             st.info("No consultations yet. Book your first consultation!")
     else:
         st.error("Doctor registry feature not available")
 
-def render_doctor_page():
+def render_doctor_page(user_role):
     """Render the doctor dashboard"""
-    from components.login_auth import is_doctor
-    
-    if not is_doctor():
+    if user_role != "doctor":
         st.error("❌ Access Denied: Only doctors can access this page.")
         return
     
@@ -800,14 +869,9 @@ def render_doctor_page():
     # Check if user is a registered doctor
     is_registered = False
     if DOCTOR_REGISTRY_AVAILABLE and 'user_data' in st.session_state:
-        from components.doctor_registry import DoctorRegistry
-        registry = DoctorRegistry()
-        conn = sqlite3.connect(str(registry.db_path))
-        cursor = conn.cursor()
-        cursor.execute('SELECT id FROM doctors WHERE user_id = ?', (st.session_state.user_data['user_id'],))
-        doctor = cursor.fetchone()
-        conn.close()
-        is_registered = doctor is not None
+        from components.doctor_registry import get_registry, is_registered_doctor
+        registry = get_registry()
+        is_registered = is_registered_doctor(st.session_state.user_data['user_id'], str(registry.db_path))
     
     if is_registered:
         # Doctor is registered, show full dashboard
@@ -833,6 +897,7 @@ def render_doctor_page():
         
         with tab1:
             if DOCTOR_REGISTRY_AVAILABLE:
+                from components.doctor_registry import render_doctor_registration
                 render_doctor_registration()
             else:
                 st.error("Doctor registry feature not available")
@@ -849,25 +914,19 @@ def render_doctor_profile():
         return
     
     if DOCTOR_REGISTRY_AVAILABLE:
-        from components.doctor_registry import DoctorRegistry
-        registry = DoctorRegistry()
-        
-        # Check if user is a registered doctor
-        conn = sqlite3.connect(str(registry.db_path))
-        cursor = conn.cursor()
+        from components.doctor_registry import get_registry
+        registry = get_registry()
         
-        cursor.execute('SELECT * FROM doctors WHERE user_id = ?', (st.session_state.user_data['user_id'],))
-        doctor = cursor.fetchone()
+        # Check if user is a registered doctor (profile and consultation counts in one query)
+        doctor_data = registry.get_doctor_with_stats(st.session_state.user_data['user_id'])
         
-        if not doctor:
+        if not doctor_data:
             st.info("You are not registered as a doctor. Please register your profile first.")
             if st.button("📝 Register as Doctor"):
-                st.session_state.current_page = "doctor_registration"
-                st.rerun()
+                navigate_to("doctor_registration")
             return
         
         # Doctor is registered, show profile
-        doctor_data = dict(zip([col[0] for col in cursor.description], doctor))
         
         col1, col2 = st.columns([2, 1])
         
@@ -907,30 +966,22 @@ def render_doctor_profile():
             st.markdown(f"**Email:** {doctor_data['email']}")
             
             if st.button("✏️ Edit Profile"):
-                st.session_state.current_page = "doctor_registration"
-                st.rerun()
-        
-        # Get consultations for this doctor
-        consultations = registry.get_doctor_consultations(doctor_data['id'])
+                navigate_to("doctor_registration")
         
         st.markdown("### 📊 Profile Statistics")
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Consultations", len(consultations))
+            st.metric("Total Consultations", doctor_data['total_count'])
         
         with col2:
-            pending_consultations = len([c for c in consultations if c[6] == 'pending'])
-            st.metric("Pending", pending_consultations)
+            st.metric("Pending", doctor_data['pending_count'])
         
         with col3:
-            completed_consultations = len([c for c in consultations if c[6] == 'completed'])
-            st.metric("Completed", completed_consultations)
+            st.metric("Completed", doctor_data['completed_count'])
         
         with col4:
             st.metric("Rating", f"{doctor_data['rating']:.1f} ⭐")
-        
-        conn.close()
     else:
         st.error("Doctor registry feature not available")
 
@@ -943,66 +994,54 @@ def render_doctor_consultations():
         return
     
     if DOCTOR_REGISTRY_AVAILABLE:
-        from components.doctor_registry import DoctorRegistry
-        registry = DoctorRegistry()
+        from components.doctor_registry import get_registry, get_doctor_id, confirm_consultation, open_consultation_chat
+        registry = get_registry()
         
         # Check if user is a registered doctor
-        conn = sqlite3.connect(str(registry.db_path))
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id FROM doctors WHERE user_id = ?', (st.session_state.user_data['user_id'],))
-        doctor_result = cursor.fetchone()
+        doctor_id = get_doctor_id(st.session_state.user_data['user_id'], str(registry.db_path))
         
-        if not doctor_result:
+        if doctor_id is None:
             st.info("You are not registered as a doctor. Please register your profile first.")
             return
         
-        doctor_id = doctor_result[0]
-        
         # Get consultations
         consultations = registry.get_doctor_consultations(doctor_id)
         
         if consultations:
-            for consultation in consultations:
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    
-                    with col1:
-                        # consultation[9] is patient_name, consultation[10] is patient_email
-                        patient_name = consultation[9] if len(consultation) > 9 else "Unknown Patient"
-                        st.markdown(f"**Patient:** {patient_name}")
-                        st.markdown(f"**Type:** {consultation[3]}")
-                        st.markdown(f"**Date:** {consultation[4]} at {consultation[5]}")
-                        if len(consultation) > 8 and consultation[8]:  # video_call_link
-                            st.markdown(f"**Video Call:** {consultation[8]}")
-                    
-                    with col2:
-                        status_color = {
-                            'pending': '🟡',
-                            'confirmed': '🟢',
-                            'completed': '🔵',
-                            'cancelled': '🔴'
-                        }.get(consultation[6], '⚪')
-                        st.markdown(f"{status_color} {consultation[6].title()}")
-                    
-                    with col3:
-                        if consultation[6] == 'pending':
-                            if st.button("✅ Confirm", key=f"confirm_{consultation[0]}"):
-                                result = registry.update_consultation_status(consultation[0], 'confirmed')
-                                if result['success']:
-                                    st.success("Consultation confirmed!")
-                                    st.rerun()
-                    
-                    with col4:
-                        if st.button("💬 Chat", key=f"chat_{consultation[0]}"):
-                            st.session_state.chat_consultation = consultation[0]
-                            st.rerun()
-                    
-                    st.divider()
+            import pandas as pd
+            
+            df = pd.DataFrame([{
+                'Patient': c.patient_name,
+                'Type': c.consultation_type,
+                'Date': f"{c.consultation_date} at {c.consultation_time}",
+                'Status': f"{STATUS_ICON.get(c.status, '⚪')} {c.status.title()}",
+                'Video Call': c.video_call_link
+            } for c in consultations])
+            event = st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={'Video Call': st.column_config.LinkColumn('Video Call')},
+                on_select="rerun",
+                selection_mode="single-row",
+                key="doctor_consultations_table"
+            )
+            
+            # Actions for the selected consultation
+            if event.selection.rows:
+                selected = consultations[event.selection.rows[0]]
+                col1, col2 = st.columns(2)
+                with col1:
+                    if selected.status == 'pending':
+                        st.button("✅ Confirm", key="doctor_confirm", use_container_width=True,
+                                  on_click=confirm_consultation, args=(selected.id,))
+                with col2:
+                    st.button("💬 Chat", key="doctor_chat", use_container_width=True,
+                              on_click=open_consultation_chat, args=(selected.id,))
+            else:
+                st.caption("Select a consultation to confirm it or open its chat.")
         else:
             st.info("No consultations yet.")
-        
-        conn.close()
     else:
         st.error("Doctor registry feature not available")
 
@@ -1014,60 +1053,67 @@ def render_batch_analysis():
     uploaded_file = st.file_uploader("Upload CSV file with patient data", type=['csv'])
     
     if uploaded_file is not None:
+        import pandas as pd
         try:
-            df = pd.read_csv(uploaded_file)
+            # Only the model features are parsed, with compact dtypes (float32 holds the
+            # integer-coded features exactly; NaN marks a missing value)
+            df = pd.read_csv(uploaded_file, usecols=lambda column: column in BATCH_FEATURE_DTYPES, dtype=BATCH_FEATURE_DTYPES)
             st.success(f"✅ Loaded {len(df)} patient records")
             st.dataframe(df.head())
             
             if st.button("🔍 Analyze All Patients", type="primary"):
                 if PREDICTOR_AVAILABLE:
-                    predictor = HeartDiseasePredictor()
+                    import numpy as np
+                    predictor = get_predictor()
                     with st.spinner("Processing patient data..."):
-                        # Process batch predictions
-                        results = []
-                        for idx, row in df.iterrows():
-                            try:
-                                prediction, probability = predictor.predict_heart_disease(row.to_dict())
-                                if prediction is not None:
-                                    risk_level = predictor.get_risk_level(probability)
-                                    results.append({
-                                        'Patient_ID': idx + 1,
-                                        'Prediction': prediction,
-                                        'Probability': probability,
-                                        'Risk_Level': risk_level
-                                    })
-                                else:
-                                    results.append({
-                                        'Patient_ID': idx + 1,
-                                        'Prediction': 'Error',
-                                        'Probability': 0,
-                                        'Risk_Level': 'Error'
-                                    })
-                            except Exception as e:
-                                results.append({
-                                    'Patient_ID': idx + 1,
-                                    'Prediction': 'Error',
-                                    'Probability': 0,
-                                    'Risk_Level': 'Error'
-                                })
+                        # Predict every complete row in a single model call; rows with
+                        # missing features are reported as errors
+                        features = df.reindex(columns=predictor.feature_names)
+                        X = np.ascontiguousarray(features.to_numpy(dtype=float))
+                        valid = np.isfinite(X).all(axis=1)
                         
-                        results_df = pd.DataFrame(results)
-                        st.markdown("### 📈 Batch Analysis Results")
-                        st.dataframe(results_df)
+                        predictions = np.full(len(df), 'Error', dtype=object)
+                        probabilities = np.zeros(len(df))
+                        risk_levels = np.full(len(df), 'Error', dtype=object)
+                        if valid.any():
+                            batch_predictions, batch_probabilities = predictor.predict_batch(X[valid])
+                            if batch_predictions is not None:
+                                predictions[valid] = batch_predictions
+                                probabilities[valid] = batch_probabilities
+                                risk_levels[valid] = predictor.get_risk_levels(probabilities[valid])
                         
-                        # Download results
-                        csv = results_df.to_csv(index=False)
-                        st.download_button(
-                            label="📥 Download Results",
-                            data=csv,
-                            file_name="heart_disease_batch_results.csv",
-                            mime="text/csv"
-                        )
+                        results_df = pd.DataFrame({
+                            'Patient_ID': np.arange(1, len(df) + 1),
+                            'Prediction': predictions,
+                            'Probability': probabilities,
+                            'Risk_Level': risk_levels
+                        })
+                        st.session_state.batch_results = (uploaded_file.file_id, results_df)
                 else:
                     st.error("❌ Prediction model not available")
+            
+            # Keep showing results for this upload until a new file is analyzed
+            batch_results = st.session_state.get('batch_results')
+            if batch_results and batch_results[0] == uploaded_file.file_id:
+                render_batch_results(batch_results[1])
         except Exception as e:
             st.error(f"❌ Error processing file: {str(e)}")
 
+@st.fragment
+def render_batch_results(results_df):
+    """Render batch analysis results; the download button reruns only this section"""
+    st.markdown("### 📈 Batch Analysis Results")
+    st.dataframe(results_df)
+    
+    # Download results
+    csv = results_df.to_csv(index=False)
+    st.download_button(
+        label="📥 Download Results",
+        data=csv,
+        file_name="heart_disease_batch_results.csv",
+        mime="text/csv"
+    )
+
 def render_about_page():
     """Render the about page"""
     st.markdown("## ℹ️ About Heart Disease Detector")
@@ -1118,42 +1164,7 @@ def render_about_page():
 
 def render_footer():
     """Render the modern footer"""
-    st.markdown("""
-        <div class="footer">
-            <div class="footer-content">
-                <div class="footer-section">
-                    <h3>Heart Disease Detector</h3>
-                    <p>AI-powered cardiovascular health assessment platform designed to help individuals and healthcare professionals make informed decisions about heart health.</p>
-                </div>
-                <div class="footer-section">
-                    <h3>Quick Links</h3>
-                    <p><a href="#">Home</a></p>
-                    <p><a href="#">Patient Assessment</a></p>
-                    <p><a href="#">Doctor Mode</a></p>
-                    <p><a href="#">Find Doctors</a></p>
-                    <p><a href="#">Generate Reports</a></p>
-                    <p><a href="#">About</a></p>
-                </div>
-                <div class="footer-section">
-                    <h3>Resources</h3>
-                    <p><a href="#">Health Guidelines</a></p>
-                    <p><a href="#">Research Papers</a></p>
-                    <p><a href="#">Medical References</a></p>
-                    <p><a href="#">FAQ</a></p>
-                </div>
-                <div class="footer-section">
-                    <h3>Legal</h3>
-                    <p><a href="#">Privacy Policy</a></p>
-                    <p><a href="#">Terms of Service</a></p>
-                    <p><a href="#">Medical Disclaimer</a></p>
-                    <p><a href="#">Cookie Policy</a></p>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; 2024 Heart Disease Detector. All rights reserved. | Made with ❤️ for better heart health</p>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 def render_doctor_directory():
     """Render doctor directory for doctors to see other doctors"""
@@ -1161,8 +1172,8 @@ def render_doctor_directory():
     st.markdown("View other healthcare professionals in the network.")
     
     if DOCTOR_REGISTRY_AVAILABLE:
-        from components.doctor_registry import DoctorRegistry
-        registry = DoctorRegistry()
+        from components.doctor_registry import get_registry, search_doctors
+        registry = get_registry()
         
         # Search filters
         with st.expander("🔍 Search Filters", expanded=False):
@@ -1197,90 +1208,90 @@ def render_doctor_directory():
             filters['max_fee'] = max_fee
         
         # Get doctors (exclude current doctor)
-        all_doctors = registry.get_doctors(filters)
-        if 'user_data' in st.session_state:
-            current_user_id = st.session_state.user_data['user_id']
-            doctors = [d for d in all_doctors if d.get('user_id') != current_user_id]
-        else:
-            doctors = all_doctors
+        current_user_id = st.session_state.user_data['user_id'] if 'user_data' in st.session_state else None
+        doctors = search_doctors(registry, tuple(sorted(filters.items())), current_user_id)
         
         if doctors:
             st.markdown(f"### Found {len(doctors)} Other Doctors")
             
-            for i, doctor in enumerate(doctors):
-                with st.container():
-                    # Create a unique key for each doctor
-                    doctor_key = f"doctor_{doctor['id']}"
-                    
-                    # Show basic info initially
-                    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"**Dr. {doctor['name']}**")
-                        st.markdown(f"*{doctor['specialization']}*")
-                    
-                    with col2:
-                        st.markdown(f"👨‍⚕️ {doctor['years_experience']} years")
-                    
-                    with col3:
-                        st.markdown(f"📍 {doctor['city']}")
-                    
-                    with col4:
-                        if st.button("👁️ Details", key=f"details_{doctor_key}"):
-                            if 'expanded_doctor' in st.session_state and st.session_state.expanded_doctor == doctor['id']:
-                                st.session_state.expanded_doctor = None
-                            else:
-                                st.session_state.expanded_doctor = doctor['id']
-                            st.rerun()
-                    
-                    # Show expanded details if this doctor is selected
-                    if 'expanded_doctor' in st.session_state and st.session_state.expanded_doctor == doctor['id']:
-                        st.markdown("---")
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown("**📋 Professional Details**")
-                            st.markdown(f"🏥 **Hospital/Clinic:** {doctor['location']}")
-                            st.markdown(f"📞 **Phone:** {doctor['phone']}")
-                            st.markdown(f"📧 **Email:** {doctor['email']}")
-                            st.markdown(f"💰 **Consultation Fee:** ₹{doctor['consultation_fee']}")
-                            st.markdown(f"🌍 **Location:** {doctor['city']}, {doctor['state']}, {doctor['country']}")
-                        
-                        with col2:
-                            st.markdown("**⭐ Ratings & Reviews**")
-                            rating = doctor.get('avg_rating', doctor.get('rating', 0))
-                            if rating is None:
-                                rating = 0.0
-                            review_count = doctor.get('review_count', doctor.get('total_reviews', 0))
-                            if review_count is None:
-                                review_count = 0
-                            st.markdown(f"⭐ **Rating:** {float(rating):.1f}/5.0")
-                            st.markdown(f"📝 **Reviews:** {int(review_count)}")
-                            
-                            if doctor.get('bio'):
-                                st.markdown("**📖 Bio:**")
-                                st.markdown(f"_{doctor['bio']}_")
-                        
-                        # Additional details
-                        if doctor.get('qualifications') or doctor.get('languages'):
-                            st.markdown("**🎓 Additional Information**")
-                            if doctor.get('qualifications'):
-                                st.markdown(f"**Qualifications:** {doctor['qualifications']}")
-                            if doctor.get('languages'):
-                                st.markdown(f"**Languages:** {doctor['languages']}")
-                        
-                        # Contact button
-                        if st.button("💬 Contact Doctor", key=f"contact_{doctor_key}"):
-                            st.info(f"Contact Dr. {doctor['name']} at {doctor['phone']} or {doctor['email']}")
-                        
-                        st.markdown("---")
-                    
-                    st.divider()
+            for doctor in doctors:
+                render_directory_card(doctor)
         else:
             st.info("No other doctors found matching your criteria. Try adjusting your filters.")
     else:
         st.error("Doctor registry feature not available")
 
+def toggle_expanded(expanded_key):
+    """Button callback: show or hide a directory card's details"""
+    st.session_state[expanded_key] = not st.session_state.get(expanded_key, False)
+
+@st.fragment
+def render_directory_card(doctor):
+    """Render one doctor directory card; its buttons rerun only this card"""
+    # Create a unique key for each doctor
+    doctor_key = f"doctor_{doctor['id']}"
+    expanded_key = f"expanded_{doctor_key}"
+    
+    # Show basic info initially
+    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    
+    with col1:
+        st.markdown(f"**Dr. {doctor['name']}**")
+        st.markdown(f"*{doctor['specialization']}*")
+    
+    with col2:
+        st.markdown(f"👨‍⚕️ {doctor['years_experience']} years")
+    
+    with col3:
+        st.markdown(f"📍 {doctor['city']}")
+    
+    with col4:
+        st.button("👁️ Details", key=f"details_{doctor_key}", on_click=toggle_expanded, args=(expanded_key,))
+    
+    # Show expanded details if this doctor is selected
+    if st.session_state.get(expanded_key, False):
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**📋 Professional Details**")
+            st.markdown(f"🏥 **Hospital/Clinic:** {doctor['location']}")
+            st.markdown(f"📞 **Phone:** {doctor['phone']}")
+            st.markdown(f"📧 **Email:** {doctor['email']}")
+            st.markdown(f"💰 **Consultation Fee:** ₹{doctor['consultation_fee']}")
+            st.markdown(f"🌍 **Location:** {doctor['city']}, {doctor['state']}, {doctor['country']}")
+        
+        with col2:
+            st.markdown("**⭐ Ratings & Reviews**")
+            rating = doctor.get('avg_rating', doctor.get('rating', 0))
+            if rating is None:
+                rating = 0.0
+            review_count = doctor.get('review_count', doctor.get('total_reviews', 0))
+            if review_count is None:
+                review_count = 0
+            st.markdown(f"⭐ **Rating:** {float(rating):.1f}/5.0")
+            st.markdown(f"📝 **Reviews:** {int(review_count)}")
+            
+            if doctor.get('bio'):
+                st.markdown("**📖 Bio:**")
+                st.markdown(f"_{doctor['bio']}_")
+        
+        # Additional details
+        if doctor.get('qualifications') or doctor.get('languages'):
+            st.markdown("**🎓 Additional Information**")
+            if doctor.get('qualifications'):
+                st.markdown(f"**Qualifications:** {doctor['qualifications']}")
+            if doctor.get('languages'):
+                st.markdown(f"**Languages:** {doctor['languages']}")
+        
+        # Contact button
+        if st.button("💬 Contact Doctor", key=f"contact_{doctor_key}"):
+            st.info(f"Contact Dr. {doctor['name']} at {doctor['phone']} or {doctor['email']}")
+        
+        st.markdown("---")
+    
+    st.divider()
+
 def render_profile_page():
     """Render the user profile page"""
     st.markdown("## 👤 My Profile")
@@ -1295,7 +1306,6 @@ def render_profile_page():
     # Add more details as needed
     st.markdown("---")
     if st.button("🔒 Logout"):
-        from components.login_auth import logout_user
         logout_user()
         st.success("Logged out successfully!")
         st.session_state.clear()
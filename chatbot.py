@@ -1,30 +1,24 @@
 import streamlit as st
+import html
 import random
+import re
+from collections import deque
 from datetime import datetime
-from pathlib import Path
-import sys
-import uuid
-import sqlite3
-
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.append(str(project_root))
-
-class HealthChatbot:
-    def __init__(self):
-        # Enhanced health knowledge base
-        self.health_knowledge = {
-            "oldpeak": "ST Depression (oldpeak) measures the depression of the ST segment on an ECG during exercise compared to rest. Normal values are 0-1mm. Values >2mm may indicate heart disease.",
-            "cp": "Chest Pain (cp) types: 0=None, 1=Typical angina, 2=Atypical angina, 3=Non-anginal pain. Higher values indicate more severe chest pain.",
-            "trestbps": "Resting Blood Pressure (trestbps) is systolic blood pressure at rest. Normal range: 90-140 mmHg. Values >140 indicate hypertension.",
-            "chol": "Cholesterol (chol) is total blood cholesterol. Normal: <200 mg/dL, Borderline: 200-239 mg/dL, High: ≥240 mg/dL.",
-            "thalach": "Maximum Heart Rate (thalach) is the highest heart rate achieved during exercise. Normal: 120-200 bpm. Lower values may indicate reduced exercise capacity.",
-            "exang": "Exercise Angina (exang): 0=No, 1=Yes. Indicates chest pain during physical activity, a key symptom of coronary artery disease."
-        }
-        
-        # Comprehensive health responses
-        self.health_responses = {
-            "heart_symptoms": """**Heart Disease Warning Signs:**
+from functools import lru_cache
+
+# Enhanced health knowledge base
+HEALTH_KNOWLEDGE = {
+    "oldpeak": "ST Depression (oldpeak) measures the depression of the ST segment on an ECG during exercise compared to rest. Normal values are 0-1mm. Values >2mm may indicate heart disease.",
+    "cp": "Chest Pain (cp) types: 0=None, 1=Typical angina, 2=Atypical angina, 3=Non-anginal pain. Higher values indicate more severe chest pain.",
+    "trestbps": "Resting Blood Pressure (trestbps) is systolic blood pressure at rest. Normal range: 90-140 mmHg. Values >140 indicate hypertension.",
+    "chol": "Cholesterol (chol) is total blood cholesterol. Normal: <200 mg/dL, Borderline: 200-239 mg/dL, High: ≥240 mg/dL.",
+    "thalach": "Maximum Heart Rate (thalach) is the highest heart rate achieved during exercise. Normal: 120-200 bpm. Lower values may indicate reduced exercise capacity.",
+    "exang": "Exercise Angina (exang): 0=No, 1=Yes. Indicates chest pain during physical activity, a key symptom of coronary artery disease."
+}
+
+# Comprehensive health responses
+HEALTH_RESPONSES = {
+    "heart_symptoms": """**Heart Disease Warning Signs:**
 
 🚨 **Emergency Symptoms (Call 911 immediately):**
 - Chest pain or pressure
@@ -55,7 +49,7 @@ class HealthChatbot:
 - Manage stress
 - Regular check-ups""",
 
-            "heart_diet": """**Heart-Healthy Diet Guidelines:**
+    "heart_diet": """**Heart-Healthy Diet Guidelines:**
 
 🥗 **Foods to Include:**
 - Fruits and vegetables (5+ servings/day)
@@ -78,7 +72,7 @@ class HealthChatbot:
 - Include fiber-rich foods
 - Stay hydrated with water""",
 
-            "heart_exercise": """**Heart-Healthy Exercise Plan:**
+    "heart_exercise": """**Heart-Healthy Exercise Plan:**
 
 🏃‍♂️ **Aerobic Exercise (150 min/week):**
 - Walking (brisk pace)
@@ -106,7 +100,7 @@ class HealthChatbot:
 - Listen to your body
 - Consult doctor before starting""",
 
-            "blood_pressure": """**Blood Pressure Guidelines:**
+    "blood_pressure": """**Blood Pressure Guidelines:**
 
 📊 **Normal:** <120/80 mmHg
 📈 **Elevated:** 120-129/<80 mmHg
@@ -128,7 +122,7 @@ class HealthChatbot:
 - Stress reduction
 - Regular doctor visits""",
 
-            "cholesterol": """**Cholesterol Guidelines:**
+    "cholesterol": """**Cholesterol Guidelines:**
 
 📊 **Total Cholesterol:** <200 mg/dL
 ✅ **HDL (Good):** >60 mg/dL
@@ -149,7 +143,7 @@ class HealthChatbot:
 - Olive oil
 - Fruits and vegetables""",
 
-            "stress": """**Stress and Heart Health:**
+    "stress": """**Stress and Heart Health:**
 
 🧠 **Stress affects your heart by:**
 - Increasing blood pressure
@@ -175,7 +169,7 @@ class HealthChatbot:
 
 **Remember:** Chronic stress is a risk factor for heart disease. Managing stress is crucial for heart health.""",
 
-            "general_heart": """**Heart Health Overview:**
+    "general_heart": """**Heart Health Overview:**
 
 ❤️ **Your heart is a vital muscle that pumps blood throughout your body.**
 
@@ -199,40 +193,146 @@ class HealthChatbot:
 - Medical treatment when needed
 
 Would you like to know more about specific topics like symptoms, diet, exercise, or risk factors?"""
-        }
-        
-        # Enhanced lifestyle tips
-        self.lifestyle_tips = [
-            "🏃‍♂️ **Exercise:** Aim for 150 minutes of moderate exercise weekly",
-            "🥗 **Diet:** Follow a heart-healthy diet rich in fruits, vegetables, and whole grains",
-            "🚭 **Smoking:** Quit smoking to reduce heart disease risk significantly",
-            "🍷 **Alcohol:** Limit alcohol intake to moderate levels",
-            "😴 **Sleep:** Get 7-9 hours of quality sleep nightly",
-            "🧘‍♀️ **Stress:** Practice stress management techniques like meditation",
-            "⚖️ **Weight:** Maintain a healthy weight through diet and exercise",
-            "🩺 **Checkups:** Regular health checkups and blood pressure monitoring",
-            "💧 **Hydration:** Drink plenty of water throughout the day",
-            "🧂 **Salt:** Reduce sodium intake to less than 2,300mg per day",
-            "🐟 **Omega-3:** Include fatty fish in your diet 2-3 times per week",
-            "🌰 **Nuts:** Eat a handful of nuts daily for heart health",
-            "🫀 **Blood Pressure:** Monitor your blood pressure regularly",
-            "🩸 **Cholesterol:** Get your cholesterol checked annually",
-            "🍎 **Fiber:** Include high-fiber foods to lower cholesterol",
-            "☕ **Caffeine:** Limit caffeine if you have heart rhythm issues",
-            "🌞 **Vitamin D:** Get adequate sunlight or supplements for heart health"
-        ]
-        
-        # Enhanced greetings
-        self.greetings = [
-            "👋 Hello! I'm your heart health assistant. How can I help you today?",
-            "💙 Hi there! I'm here to help with your heart health questions.",
-            "🫀 Welcome! I can explain medical terms, interpret results, or share lifestyle tips.",
-            "❤️ Hello! I'm your AI heart health companion. Ask me anything about heart health!",
-            "🩺 Hi! I can help you understand heart disease, lifestyle tips, and medical terms.",
-            "💪 Welcome! I'm your personal heart health advisor. What would you like to know?",
-            "🫀 Hello! I can help with heart disease prevention, symptoms, and healthy living tips.",
-            "❤️ Hi there! I'm here to support your heart health journey. How can I assist you?"
-        ]
+}
+
+# Enhanced lifestyle tips
+LIFESTYLE_TIPS = (
+    "🏃‍♂️ **Exercise:** Aim for 150 minutes of moderate exercise weekly",
+    "🥗 **Diet:** Follow a heart-healthy diet rich in fruits, vegetables, and whole grains",
+    "🚭 **Smoking:** Quit smoking to reduce heart disease risk significantly",
+    "🍷 **Alcohol:** Limit alcohol intake to moderate levels",
+    "😴 **Sleep:** Get 7-9 hours of quality sleep nightly",
+    "🧘‍♀️ **Stress:** Practice stress management techniques like meditation",
+    "⚖️ **Weight:** Maintain a healthy weight through diet and exercise",
+    "🩺 **Checkups:** Regular health checkups and blood pressure monitoring",
+    "💧 **Hydration:** Drink plenty of water throughout the day",
+    "🧂 **Salt:** Reduce sodium intake to less than 2,300mg per day",
+    "🐟 **Omega-3:** Include fatty fish in your diet 2-3 times per week",
+    "🌰 **Nuts:** Eat a handful of nuts daily for heart health",
+    "🫀 **Blood Pressure:** Monitor your blood pressure regularly",
+    "🩸 **Cholesterol:** Get your cholesterol checked annually",
+    "🍎 **Fiber:** Include high-fiber foods to lower cholesterol",
+    "☕ **Caffeine:** Limit caffeine if you have heart rhythm issues",
+    "🌞 **Vitamin D:** Get adequate sunlight or supplements for heart health"
+)
+
+# Enhanced greetings
+GREETINGS = (
+    "👋 Hello! I'm your heart health assistant. How can I help you today?",
+    "💙 Hi there! I'm here to help with your heart health questions.",
+    "🫀 Welcome! I can explain medical terms, interpret results, or share lifestyle tips.",
+    "❤️ Hello! I'm your AI heart health companion. Ask me anything about heart health!",
+    "🩺 Hi! I can help you understand heart disease, lifestyle tips, and medical terms.",
+    "💪 Welcome! I'm your personal heart health advisor. What would you like to know?",
+    "🫀 Hello! I can help with heart disease prevention, symptoms, and healthy living tips.",
+    "❤️ Hi there! I'm here to support your heart health journey. How can I assist you?"
+)
+
+def _keywords(*words):
+    """Pattern matching any of the words as a substring, in a single scan"""
+    return re.compile('|'.join(map(re.escape, words)))
+
+# get_response routing, checked in order: (keywords, qualifiers or None, response key).
+# A rule fires when the input contains a keyword and, if given, a qualifier too.
+RESPONSE_RULES = [
+    (_keywords('symptom', 'sign', 'warning', 'emergency'), _keywords('heart', 'cardiac', 'chest'), 'heart_symptoms'),
+    (_keywords('diet', 'food', 'nutrition', 'eat', 'meal'), _keywords('heart', 'healthy'), 'heart_diet'),
+    (_keywords('exercise', 'workout', 'fitness', 'activity', 'sport'), _keywords('heart', 'cardio'), 'heart_exercise'),
+    (_keywords('blood pressure', 'hypertension', 'bp'), None, 'blood_pressure'),
+    (_keywords('cholesterol', 'lipid', 'hdl', 'ldl'), None, 'cholesterol'),
+    (_keywords('stress', 'anxiety', 'mental', 'relax'), None, 'stress'),
+    (_keywords('heart', 'cardiac', 'cardiovascular'), None, 'general_heart'),
+]
+TIPS_KEYWORDS = _keywords("lifestyle", "tips", "advice", "healthy", "prevention")
+RESULT_KEYWORDS = _keywords("result", "prediction", "assessment")
+GREETING_KEYWORDS = _keywords("hello", "hi", "hey", "good morning", "good afternoon", "good evening")
+HELP_KEYWORDS = _keywords("help", "what can you do", "capabilities", "features")
+
+# generate_ai_response routing, same format (its keyword lists differ slightly from get_response's)
+AI_HEART_KEYWORDS = _keywords('heart', 'cardiac', 'cardiovascular')
+AI_RESPONSE_RULES = [
+    (_keywords('symptoms', 'signs', 'warning'), AI_HEART_KEYWORDS, 'heart_symptoms'),
+    (_keywords('diet', 'food', 'nutrition', 'eat'), AI_HEART_KEYWORDS, 'heart_diet'),
+    (_keywords('exercise', 'workout', 'fitness', 'activity'), AI_HEART_KEYWORDS, 'heart_exercise'),
+    (AI_HEART_KEYWORDS, None, 'general_heart'),
+    (_keywords('blood pressure', 'hypertension'), None, 'blood_pressure'),
+    (_keywords('cholesterol', 'lipid'), None, 'cholesterol'),
+    (_keywords('stress', 'anxiety', 'mental'), None, 'stress'),
+]
+
+def match_response(rules, text: str):
+    """Response key of the first rule the text satisfies, or None"""
+    for keywords, qualifiers, response_key in rules:
+        if keywords.search(text) and (qualifiers is None or qualifiers.search(text)):
+            return response_key
+    return None
+
+# Personalized recommendations: (field, threshold, message) when the value exceeds the
+# threshold. Only the first matching rule per field applies, so age gets a single message.
+RECOMMENDATION_RULES = [
+    ('age', 65, "🕐 **Age Factor:** As you're over 65, consider more frequent health checkups."),
+    ('age', 45, "🕐 **Age Factor:** Middle age is crucial for heart health."),
+    ('trestbps', 140, "🩺 **Blood Pressure:** Your elevated blood pressure requires attention."),
+    ('chol', 240, "🩸 **Cholesterol:** High cholesterol detected. Focus on heart-healthy diet."),
+    ('cp', 1, "💔 **Chest Pain:** Significant chest pain requires immediate medical attention."),
+]
+
+# Reply to help requests
+HELP_RESPONSE = """I'm your AI heart health assistant! Here's what I can help you with:
+
+💡 **Medical Terms:** Explain terms like 'oldpeak', 'cp', 'trestbps', 'chol', etc.
+🏥 **Symptoms:** Heart disease warning signs and emergency symptoms
+🥗 **Diet:** Heart-healthy nutrition guidelines
+🏃‍♂️ **Exercise:** Fitness plans for heart health
+🩺 **Health Topics:** Blood pressure, cholesterol, stress management
+📊 **Results:** Interpret your risk assessment results
+💬 **Lifestyle:** Personalized tips and recommendations
+
+Just ask me anything about heart health!"""
+
+# Longest chat history kept per session; older messages are dropped first
+MAX_CHAT_MESSAGES = 100
+
+# Banner at the top of render_simple_chatbot's expander
+CHATBOT_HEADER_HTML = """
+<div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 15px; border-radius: 10px; color: white; margin-bottom: 15px;'>
+    <h4 style='margin: 0;'>💬 Chat with your Heart Health Assistant</h4>
+</div>
+"""
+
+# Chat bubbles for render_simple_chatbot, filled with the HTML-escaped message content
+USER_MESSAGE_HTML = "<div style='background: #e3f2fd; padding: 10px; border-radius: 10px; margin: 5px 0; text-align: right;'><strong>You:</strong> {}</div>"
+ASSISTANT_MESSAGE_HTML = "<div style='background: #f5f5f5; padding: 10px; border-radius: 10px; margin: 5px 0;'><strong>Assistant:</strong> {}</div>"
+
+@lru_cache(maxsize=256)
+def route_message(text: str) -> tuple:
+    """Pick the kind of reply for a lower-cased message, as (route, key).
+    
+    Routing depends only on the text, so it is cached; the replies themselves are
+    not, since tips and greetings are random and results come from the session.
+    """
+    for term in HEALTH_KNOWLEDGE:
+        if term in text:
+            return 'knowledge', term
+    
+    response_key = match_response(RESPONSE_RULES, text)
+    if response_key:
+        return 'response', response_key
+    
+    for route, keywords in (('tips', TIPS_KEYWORDS), ('result', RESULT_KEYWORDS),
+                            ('greeting', GREETING_KEYWORDS), ('help', HELP_KEYWORDS)):
+        if keywords.search(text):
+            return route, None
+    
+    return 'default', None
+
+class HealthChatbot:
+    def __init__(self):
+        # Shared reference data (module constants, built once at import)
+        self.health_knowledge = HEALTH_KNOWLEDGE
+        self.health_responses = HEALTH_RESPONSES
+        self.lifestyle_tips = LIFESTYLE_TIPS
+        self.greetings = GREETINGS
 
     def get_personalized_recommendations(self, user_data=None):
         """Generate personalized recommendations based on user data."""
@@ -240,256 +340,58 @@ Would you like to know more about specific topics like symptoms, diet, exercise,
             return "I can provide personalized recommendations once you complete a risk assessment."
         
         recommendations = []
+        matched_fields = set()
         
-        if user_data.get('age', 0) > 65:
-            recommendations.append("🕐 **Age Factor:** As you're over 65, consider more frequent health checkups.")
-        elif user_data.get('age', 0) > 45:
-            recommendations.append("🕐 **Age Factor:** Middle age is crucial for heart health.")
-        
-        if user_data.get('trestbps', 0) > 140:
-            recommendations.append("🩺 **Blood Pressure:** Your elevated blood pressure requires attention.")
-        
-        if user_data.get('chol', 0) > 240:
-            recommendations.append("🩸 **Cholesterol:** High cholesterol detected. Focus on heart-healthy diet.")
-        
-        if user_data.get('cp', 0) > 1:
-            recommendations.append("💔 **Chest Pain:** Significant chest pain requires immediate medical attention.")
+        for field, threshold, message in RECOMMENDATION_RULES:
+            if field not in matched_fields and user_data.get(field, 0) > threshold:
+                recommendations.append(message)
+                matched_fields.add(field)
         
         if not recommendations:
             recommendations.append("✅ **Good News:** Your current parameters look healthy!")
         
         return "\n\n".join(recommendations)
 
+    def get_result_summary(self):
+        """Summarize the session's last risk assessment, if there is one."""
+        if "last_result" in st.session_state:
+            result = st.session_state.last_result
+            if result:
+                pred = result['prediction']
+                prob = result['probability']
+                if pred == 1:
+                    return f"Your last assessment showed **HIGH RISK** ({prob:.1%}). Please consult a healthcare professional immediately."
+                else:
+                    return f"Your last assessment showed **LOW RISK** ({prob:.1%}). Continue maintaining a healthy lifestyle!"
+        return "I don't see any recent assessment results. Please complete a risk assessment first."
+
     def get_response(self, user_input):
         """Generate enhanced chatbot response based on user input."""
-        user_input_lower = user_input.lower().strip()
+        route, key = route_message(user_input.lower().strip())
         
         # Check for health term explanations
-        for term in self.health_knowledge:
-            if term in user_input_lower:
-                return self.health_knowledge[term]
+        if route == 'knowledge':
+            return self.health_knowledge[key]
         
         # Check for comprehensive health responses
-        if any(word in user_input_lower for word in ['symptom', 'sign', 'warning', 'emergency']):
-            if any(word in user_input_lower for word in ['heart', 'cardiac', 'chest']):
-                return """**Heart Disease Warning Signs:**
-
-🚨 **Emergency Symptoms (Call 911 immediately):**
-- Chest pain or pressure
-- Shortness of breath
-- Pain spreading to arms, neck, jaw
-- Cold sweats, nausea, lightheadedness
-
-⚠️ **Other Symptoms:**
-- Fatigue
-- Swelling in legs/ankles
-- Irregular heartbeat
-- Dizziness
-
-**Risk Factors:**
-- High blood pressure
-- High cholesterol
-- Diabetes
-- Smoking
-- Obesity
-- Family history
-- Age (45+ for men, 55+ for women)
-
-**Prevention Tips:**
-- Regular exercise (150 min/week)
-- Healthy diet (DASH or Mediterranean)
-- No smoking
-- Limit alcohol
-- Manage stress
-- Regular check-ups"""
-        
-        if any(word in user_input_lower for word in ['diet', 'food', 'nutrition', 'eat', 'meal']):
-            if any(word in user_input_lower for word in ['heart', 'healthy']):
-                return """**Heart-Healthy Diet Guidelines:**
-
-🥗 **Foods to Include:**
-- Fruits and vegetables (5+ servings/day)
-- Whole grains (oats, brown rice, quinoa)
-- Lean proteins (fish, chicken, legumes)
-- Healthy fats (olive oil, nuts, avocados)
-- Low-fat dairy
-
-❌ **Foods to Limit:**
-- Saturated fats (red meat, butter)
-- Trans fats (processed foods)
-- Sodium (salt) - aim for <2,300mg/day
-- Added sugars
-- Processed foods
-
-💡 **Tips:**
-- Use herbs/spices instead of salt
-- Choose lean cuts of meat
-- Eat fish 2-3 times/week
-- Include fiber-rich foods
-- Stay hydrated with water"""
-        
-        if any(word in user_input_lower for word in ['exercise', 'workout', 'fitness', 'activity', 'sport']):
-            if any(word in user_input_lower for word in ['heart', 'cardio']):
-                return """**Heart-Healthy Exercise Plan:**
-
-🏃‍♂️ **Aerobic Exercise (150 min/week):**
-- Walking (brisk pace)
-- Jogging/running
-- Cycling
-- Swimming
-- Dancing
-- Tennis
-
-💪 **Strength Training (2-3 days/week):**
-- Weight lifting
-- Resistance bands
-- Bodyweight exercises
-- Yoga/Pilates
-
-🎯 **Target Heart Rate:**
-- Moderate intensity: 50-70% of max HR
-- Vigorous intensity: 70-85% of max HR
-- Max HR = 220 - your age
-
-⚠️ **Safety Tips:**
-- Start slowly and gradually increase
-- Warm up and cool down
-- Stay hydrated
-- Listen to your body
-- Consult doctor before starting"""
-        
-        if any(word in user_input_lower for word in ['blood pressure', 'hypertension', 'bp']):
-            return """**Blood Pressure Guidelines:**
-
-📊 **Normal:** <120/80 mmHg
-📈 **Elevated:** 120-129/<80 mmHg
-⚠️ **High Stage 1:** 130-139/80-89 mmHg
-🚨 **High Stage 2:** ≥140/≥90 mmHg
-
-**Risk Factors:**
-- Age
-- Family history
-- Obesity
-- High salt intake
-- Stress
-- Lack of exercise
-
-**Management:**
-- Regular monitoring
-- Medication if prescribed
-- Lifestyle changes
-- Stress reduction
-- Regular doctor visits"""
-        
-        if any(word in user_input_lower for word in ['cholesterol', 'lipid', 'hdl', 'ldl']):
-            return """**Cholesterol Guidelines:**
-
-📊 **Total Cholesterol:** <200 mg/dL
-✅ **HDL (Good):** >60 mg/dL
-❌ **LDL (Bad):** <100 mg/dL
-⚠️ **Triglycerides:** <150 mg/dL
-
-**To Lower Cholesterol:**
-- Reduce saturated fats
-- Increase fiber intake
-- Exercise regularly
-- Maintain healthy weight
-- Consider medication if needed
-
-**Foods that Help:**
-- Oats and whole grains
-- Fatty fish
-- Nuts and seeds
-- Olive oil
-- Fruits and vegetables"""
-        
-        if any(word in user_input_lower for word in ['stress', 'anxiety', 'mental', 'relax']):
-            return """**Stress and Heart Health:**
-
-🧠 **Stress affects your heart by:**
-- Increasing blood pressure
-- Raising heart rate
-- Causing inflammation
-- Leading to unhealthy habits
-
-**Stress Management Techniques:**
-- Deep breathing exercises
-- Meditation/mindfulness
-- Regular exercise
-- Adequate sleep (7-9 hours)
-- Social connections
-- Hobbies and relaxation
-- Professional counseling if needed
-
-**Warning Signs of Stress:**
-- Irritability
-- Sleep problems
-- Fatigue
-- Headaches
-- Digestive issues
-
-**Remember:** Chronic stress is a risk factor for heart disease. Managing stress is crucial for heart health."""
-        
-        if any(word in user_input_lower for word in ['heart', 'cardiac', 'cardiovascular']):
-            return """**Heart Health Overview:**
-
-❤️ **Your heart is a vital muscle that pumps blood throughout your body.**
-
-**Key Functions:**
-- Delivers oxygen and nutrients
-- Removes waste products
-- Maintains blood pressure
-- Regulates body temperature
-
-**Heart Disease Types:**
-- Coronary artery disease
-- Heart failure
-- Arrhythmias
-- Heart valve problems
-- Congenital heart defects
-
-**Prevention is Key:**
-- Regular check-ups
-- Healthy lifestyle
-- Early detection
-- Medical treatment when needed
-
-Would you like to know more about specific topics like symptoms, diet, exercise, or risk factors?"""
+        if route == 'response':
+            return self.health_responses[key]
         
         # Check for lifestyle tips
-        if any(keyword in user_input_lower for keyword in ["lifestyle", "tips", "advice", "healthy", "prevention"]):
+        if route == 'tips':
             return random.choice(self.lifestyle_tips)
         
         # Check for result interpretation
-        if "result" in user_input_lower or "prediction" in user_input_lower or "assessment" in user_input_lower:
-            if "last_result" in st.session_state:
-                result = st.session_state.last_result
-                if result:
-                    pred = result['prediction']
-                    prob = result['probability']
-                    if pred == 1:
-                        return f"Your last assessment showed **HIGH RISK** ({prob:.1%}). Please consult a healthcare professional immediately."
-                    else:
-                        return f"Your last assessment showed **LOW RISK** ({prob:.1%}). Continue maintaining a healthy lifestyle!"
-            return "I don't see any recent assessment results. Please complete a risk assessment first."
+        if route == 'result':
+            return self.get_result_summary()
         
         # Check for greetings
-        if any(keyword in user_input_lower for keyword in ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]):
+        if route == 'greeting':
             return random.choice(self.greetings)
         
         # Check for help requests
-        if any(keyword in user_input_lower for keyword in ["help", "what can you do", "capabilities", "features"]):
-            return """I'm your AI heart health assistant! Here's what I can help you with:
-
-💡 **Medical Terms:** Explain terms like 'oldpeak', 'cp', 'trestbps', 'chol', etc.
-🏥 **Symptoms:** Heart disease warning signs and emergency symptoms
-🥗 **Diet:** Heart-healthy nutrition guidelines
-🏃‍♂️ **Exercise:** Fitness plans for heart health
-🩺 **Health Topics:** Blood pressure, cholesterol, stress management
-📊 **Results:** Interpret your risk assessment results
-💬 **Lifestyle:** Personalized tips and recommendations
-
-Just ask me anything about heart health!"""
+        if route == 'help':
+            return HELP_RESPONSE
         
         # Default response with suggestions
         return """I'm here to help with heart health questions! 
@@ -507,22 +409,61 @@ You can ask me about:
 
 What would you like to know more about?"""
 
+def new_chat_history() -> deque:
+    """Empty chat history that keeps only the most recent MAX_CHAT_MESSAGES messages"""
+    return deque(maxlen=MAX_CHAT_MESSAGES)
+
+@st.cache_resource
+def get_chatbot() -> HealthChatbot:
+    """Shared chatbot instance; it only holds read-only reference data"""
+    return HealthChatbot()
+
 def initialize_chatbot():
     """Initialize chatbot session state."""
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = new_chat_history()
     if "chatbot_initialized" not in st.session_state:
         st.session_state.chatbot_initialized = False
 
+def add_chat_exchange(question: str, answer: str):
+    """Append a user message and the assistant's reply, stamped with one shared time"""
+    now = datetime.now()
+    st.session_state.chat_history.append({"role": "user", "content": question, "timestamp": now})
+    st.session_state.chat_history.append({"role": "assistant", "content": answer, "timestamp": now})
+
+# Quick-action buttons: (label, key, message shown as the user's, reply given the chatbot)
+QUICK_ACTIONS = [
+    ("💡 Tips", "tips", "Give me lifestyle tips", lambda chatbot: random.choice(chatbot.lifestyle_tips)),
+    ("📊 Results", "results", "Explain my results", lambda chatbot: chatbot.get_result_summary()),
+    ("🎯 Advice", "advice", "Give me personalized advice",
+     lambda chatbot: chatbot.get_personalized_recommendations(st.session_state.get('user_inputs', {}))),
+    ("🏥 Symptoms", "symptoms", "What are heart disease symptoms?",
+     lambda chatbot: chatbot.health_responses["heart_symptoms"]),
+    ("🥗 Diet", "diet", "What is a heart-healthy diet?", lambda chatbot: chatbot.health_responses["heart_diet"]),
+    ("🏃‍♂️ Exercise", "exercise", "What exercises are good for heart health?",
+     lambda chatbot: chatbot.health_responses["heart_exercise"]),
+]
+
+def run_quick_action(question: str, reply):
+    """Quick-action button callback: add the canned question and its reply to the chat"""
+    add_chat_exchange(question, reply(get_chatbot()))
+
+def send_chatbot_message(input_key: str):
+    """Send button callback: answer the typed message, then clear the input"""
+    user_input = st.session_state[input_key]
+    if user_input.strip():
+        add_chat_exchange(user_input, get_chatbot().get_response(user_input))
+        st.session_state[input_key] = ""
+
 def render_simple_chatbot():
     """Render a simple expandable chatbot."""
     
     # Initialize chatbot
     initialize_chatbot()
-    chatbot = HealthChatbot()
+    chatbot = get_chatbot()
     
-    # Generate unique keys for this instance
-    unique_id = str(uuid.uuid4())[:8]
+    # Stable widget keys, so widget state survives reruns
+    unique_id = "chatbot"
     
     # Add initial greeting if not already done
     if not st.session_state.chatbot_initialized:
@@ -535,170 +476,40 @@ def render_simple_chatbot():
     
     # Create expander for chatbot
     with st.expander("🫀 Heart Health Assistant", expanded=False):
-        st.markdown("""
-        <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 15px; border-radius: 10px; color: white; margin-bottom: 15px;'>
-            <h4 style='margin: 0;'>💬 Chat with your Heart Health Assistant</h4>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(CHATBOT_HEADER_HTML, unsafe_allow_html=True)
         
         # Display chat history
         chat_container = st.container()
         with chat_container:
-            for message in st.session_state.chat_history:
-                if message["role"] == "user":
-                    st.markdown(f"""
-                    <div style='background: #e3f2fd; padding: 10px; border-radius: 10px; margin: 5px 0; text-align: right;'>
-                        <strong>You:</strong> {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style='background: #f5f5f5; padding: 10px; border-radius: 10px; margin: 5px 0;'>
-                        <strong>Assistant:</strong> {message["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-        
-        # Quick action buttons with unique keys
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            if st.button("💡 Tips", key=f"tips_btn_{unique_id}"):
-                tip = random.choice(chatbot.lifestyle_tips)
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "Give me lifestyle tips",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": tip,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
-        
-        with col2:
-            if st.button("📊 Results", key=f"results_btn_{unique_id}"):
-                response = chatbot.get_response("result")
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "Explain my results",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
-        
-        with col3:
-            if st.button("🎯 Advice", key=f"advice_btn_{unique_id}"):
-                # Get user data from session state if available
-                user_data = st.session_state.get('user_inputs', {})
-                advice = chatbot.get_personalized_recommendations(user_data)
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "Give me personalized advice",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": advice,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
-        
-        # Additional quick action buttons
-        col4, col5, col6 = st.columns(3)
-        with col4:
-            if st.button("🏥 Symptoms", key=f"symptoms_btn_{unique_id}"):
-                response = chatbot.get_response("heart symptoms")
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "What are heart disease symptoms?",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
-        
-        with col5:
-            if st.button("🥗 Diet", key=f"diet_btn_{unique_id}"):
-                response = chatbot.get_response("heart diet")
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "What is a heart-healthy diet?",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
-        
-        with col6:
-            if st.button("🏃‍♂️ Exercise", key=f"exercise_btn_{unique_id}"):
-                response = chatbot.get_response("heart exercise")
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "What exercises are good for heart health?",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
+            if st.session_state.chat_history:
+                st.markdown("\n\n".join(
+                    (USER_MESSAGE_HTML if message["role"] == "user" else ASSISTANT_MESSAGE_HTML).format(
+                        html.escape(message["content"], quote=False))
+                    for message in st.session_state.chat_history
+                ), unsafe_allow_html=True)
+        
+        # Quick action buttons, in rows of three
+        for row_start in range(0, len(QUICK_ACTIONS), 3):
+            for col, (label, key, question, reply) in zip(st.columns(3), QUICK_ACTIONS[row_start:row_start + 3]):
+                with col:
+                    st.button(label, key=f"{key}_btn_{unique_id}", on_click=run_quick_action, args=(question, reply))
         
         # Chat input with unique key
-        user_input = st.text_input("Type your message:", key=f"chat_input_{unique_id}", placeholder="Ask about heart health...")
+        st.text_input("Type your message:", key=f"chat_input_{unique_id}", placeholder="Ask about heart health...")
         
         # Send button and help button in same row
         col_send, col_help = st.columns([3, 1])
         with col_send:
-            if st.button("💬 Send", key=f"send_btn_{unique_id}"):
-                if user_input.strip():
-                    # Add user message to chat history
-                    st.session_state.chat_history.append({
-                        "role": "user",
-                        "content": user_input,
-                        "timestamp": datetime.now()
-                    })
-                    
-                    # Get chatbot response
-                    response = chatbot.get_response(user_input)
-                    
-                    # Add chatbot response to chat history
-                    st.session_state.chat_history.append({
-                        "role": "assistant",
-                        "content": response,
-                        "timestamp": datetime.now()
-                    })
-                    
-                    st.rerun()
+            st.button("💬 Send", key=f"send_btn_{unique_id}",
+                      on_click=send_chatbot_message, args=(f"chat_input_{unique_id}",))
         
         with col_help:
-            if st.button("❓ Help", key=f"help_btn_{unique_id}"):
-                help_response = chatbot.get_response("help")
-                st.session_state.chat_history.append({
-                    "role": "user",
-                    "content": "What can you help me with?",
-                    "timestamp": datetime.now()
-                })
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": help_response,
-                    "timestamp": datetime.now()
-                })
-                st.rerun()
+            st.button("❓ Help", key=f"help_btn_{unique_id}",
+                      on_click=add_chat_exchange, args=("What can you help me with?", HELP_RESPONSE))
         
         # Clear chat button
         if st.button("🗑️ Clear Chat", key=f"clear_btn_{unique_id}"):
-            st.session_state.chat_history = []
+            st.session_state.chat_history = new_chat_history()
             st.rerun()
 
 def add_chatbot_to_page():
@@ -721,7 +532,7 @@ def render_ai_chatbot():
     
     # Initialize chat history
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = new_chat_history()
     
     # Display chat history
     for message in st.session_state.chat_history:
@@ -747,201 +558,20 @@ def render_ai_chatbot():
     
     # Clear chat button
     if st.button("🗑️ Clear Chat"):
-        st.session_state.chat_history = []
+        st.session_state.chat_history = new_chat_history()
         st.rerun()
 
 def generate_ai_response(prompt: str) -> str:
     """Generate AI response based on user prompt"""
     prompt_lower = prompt.lower()
     
-    # Heart health related responses
-    if any(word in prompt_lower for word in ['heart', 'cardiac', 'cardiovascular']):
-        if any(word in prompt_lower for word in ['symptoms', 'signs', 'warning']):
-            return """**Heart Disease Warning Signs:**
-            
-🚨 **Emergency Symptoms (Call 911 immediately):**
-- Chest pain or pressure
-- Shortness of breath
-- Pain spreading to arms, neck, jaw
-- Cold sweats, nausea, lightheadedness
-
-⚠️ **Other Symptoms:**
-- Fatigue
-- Swelling in legs/ankles
-- Irregular heartbeat
-- Dizziness
-
-**Risk Factors:**
-- High blood pressure
-- High cholesterol
-- Diabetes
-- Smoking
-- Obesity
-- Family history
-- Age (45+ for men, 55+ for women)
-
-**Prevention Tips:**
-- Regular exercise (150 min/week)
-- Healthy diet (DASH or Mediterranean)
-- No smoking
-- Limit alcohol
-- Manage stress
-- Regular check-ups"""
-        
-        elif any(word in prompt_lower for word in ['diet', 'food', 'nutrition', 'eat']):
-            return """**Heart-Healthy Diet Guidelines:**
-
-🥗 **Foods to Include:**
-- Fruits and vegetables (5+ servings/day)
-- Whole grains (oats, brown rice, quinoa)
-- Lean proteins (fish, chicken, legumes)
-- Healthy fats (olive oil, nuts, avocados)
-- Low-fat dairy
-
-❌ **Foods to Limit:**
-- Saturated fats (red meat, butter)
-- Trans fats (processed foods)
-- Sodium (salt) - aim for <2,300mg/day
-- Added sugars
-- Processed foods
-
-💡 **Tips:**
-- Use herbs/spices instead of salt
-- Choose lean cuts of meat
-- Eat fish 2-3 times/week
-- Include fiber-rich foods
-- Stay hydrated with water"""
-        
-        elif any(word in prompt_lower for word in ['exercise', 'workout', 'fitness', 'activity']):
-            return """**Heart-Healthy Exercise Plan:**
-
-🏃‍♂️ **Aerobic Exercise (150 min/week):**
-- Walking (brisk pace)
-- Jogging/running
-- Cycling
-- Swimming
-- Dancing
-- Tennis
-
-💪 **Strength Training (2-3 days/week):**
-- Weight lifting
-- Resistance bands
-- Bodyweight exercises
-- Yoga/Pilates
-
-🎯 **Target Heart Rate:**
-- Moderate intensity: 50-70% of max HR
-- Vigorous intensity: 70-85% of max HR
-- Max HR = 220 - your age
-
-⚠️ **Safety Tips:**
-- Start slowly and gradually increase
-- Warm up and cool down
-- Stay hydrated
-- Listen to your body
-- Consult doctor before starting"""
-        
-        else:
-            return """**Heart Health Overview:**
-
-❤️ **Your heart is a vital muscle that pumps blood throughout your body.**
-
-**Key Functions:**
-- Delivers oxygen and nutrients
-- Removes waste products
-- Maintains blood pressure
-- Regulates body temperature
-
-**Heart Disease Types:**
-- Coronary artery disease
-- Heart failure
-- Arrhythmias
-- Heart valve problems
-- Congenital heart defects
-
-**Prevention is Key:**
-- Regular check-ups
-- Healthy lifestyle
-- Early detection
-- Medical treatment when needed
-
-Would you like to know more about specific topics like symptoms, diet, exercise, or risk factors?"""
-    
-    # General health responses
-    elif any(word in prompt_lower for word in ['blood pressure', 'hypertension']):
-        return """**Blood Pressure Guidelines:**
-
-📊 **Normal:** <120/80 mmHg
-📈 **Elevated:** 120-129/<80 mmHg
-⚠️ **High Stage 1:** 130-139/80-89 mmHg
-🚨 **High Stage 2:** ≥140/≥90 mmHg
-
-**Risk Factors:**
-- Age
-- Family history
-- Obesity
-- High salt intake
-- Stress
-- Lack of exercise
-
-**Management:**
-- Regular monitoring
-- Medication if prescribed
-- Lifestyle changes
-- Stress reduction
-- Regular doctor visits"""
-    
-    elif any(word in prompt_lower for word in ['cholesterol', 'lipid']):
-        return """**Cholesterol Guidelines:**
-
-📊 **Total Cholesterol:** <200 mg/dL
-✅ **HDL (Good):** >60 mg/dL
-❌ **LDL (Bad):** <100 mg/dL
-⚠️ **Triglycerides:** <150 mg/dL
-
-**To Lower Cholesterol:**
-- Reduce saturated fats
-- Increase fiber intake
-- Exercise regularly
-- Maintain healthy weight
-- Consider medication if needed
-
-**Foods that Help:**
-- Oats and whole grains
-- Fatty fish
-- Nuts and seeds
-- Olive oil
-- Fruits and vegetables"""
+    # Heart health and general health responses
+    response_key = match_response(AI_RESPONSE_RULES, prompt_lower)
+    if response_key:
+        return HEALTH_RESPONSES[response_key]
     
-    elif any(word in prompt_lower for word in ['stress', 'anxiety', 'mental']):
-        return """**Stress and Heart Health:**
-
-🧠 **Stress affects your heart by:**
-- Increasing blood pressure
-- Raising heart rate
-- Causing inflammation
-- Leading to unhealthy habits
-
-**Stress Management Techniques:**
-- Deep breathing exercises
-- Meditation/mindfulness
-- Regular exercise
-- Adequate sleep (7-9 hours)
-- Social connections
-- Hobbies and relaxation
-- Professional counseling if needed
-
-**Warning Signs of Stress:**
-- Irritability
-- Sleep problems
-- Fatigue
-- Headaches
-- Digestive issues
-
-**Remember:** Chronic stress is a risk factor for heart disease. Managing stress is crucial for heart health."""
-    
-    else:
-        return """I'm here to help with heart health questions! 
+    # Default response with suggestions
+    return """I'm here to help with heart health questions! 
 
 You can ask me about:
 - Heart disease symptoms and warning signs
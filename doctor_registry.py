@@ -3,10 +3,16 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import secrets
+from collections import namedtuple
+
+from components.login_auth import is_doctor, is_patient
+
+# A doctor's consultation joined with the patient's user record
+Consultation = namedtuple('Consultation', [
+    'id', 'doctor_id', 'patient_id', 'consultation_type', 'consultation_date',
+    'consultation_time', 'status', 'video_call_link', 'patient_name', 'patient_email'
+])
 
 class DoctorRegistry:
     """Doctor registry system with ratings, experience, and contact features."""
@@ -96,6 +102,12 @@ class DoctorRegistry:
                 )
             ''')
             
+            # Indexes for the per-consultation, per-doctor, per-patient and per-user lookups
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_msgs_consult ON chat_messages(consultation_id, created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_cons_doctor ON consultations(doctor_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_cons_patient ON consultations(patient_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_doctors_user ON doctors(user_id)')
+            
             conn.commit()
             conn.close()
             
@@ -270,14 +282,16 @@ class DoctorRegistry:
             doctor_id = cursor.lastrowid
             conn.commit()
             conn.close()
+            is_registered_doctor.clear()
+            search_doctors.clear()
             
             return {'success': True, 'doctor_id': doctor_id, 'message': 'Doctor registered successfully'}
             
         except Exception as e:
             return {'success': False, 'message': f'Registration failed: {str(e)}'}
     
-    def get_doctors(self, filters: dict = None) -> list:
-        """Get doctors with optional filters"""
+    def get_doctors(self, filters: dict = None, exclude_user_id: int = None) -> list:
+        """Get doctors with optional filters, optionally leaving out one user's own profile"""
         try:
             conn = sqlite3.connect(str(self.db_path))
             
@@ -309,12 +323,20 @@ class DoctorRegistry:
                     query += ' AND d.consultation_fee <= ?'
                     params.append(filters['max_fee'])
             
+            if exclude_user_id is not None:
+                # IS NOT keeps doctors without a linked user account (user_id NULL)
+                query += ' AND d.user_id IS NOT ?'
+                params.append(exclude_user_id)
+            
             query += ' GROUP BY d.id ORDER BY avg_rating DESC, d.years_experience DESC'
             
-            df = pd.read_sql_query(query, conn, params=params)
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(query, params)
+            doctors = [dict(row) for row in cursor.fetchall()]
             conn.close()
             
-            return df.to_dict('records')
+            return doctors
             
         except Exception as e:
             st.error(f"Error fetching doctors: {e}")
@@ -399,6 +421,7 @@ class DoctorRegistry:
             consultation_id = cursor.lastrowid
             conn.commit()
             conn.close()
+            get_patient_consultations_cached.clear()
             
             return {
                 'success': True, 
@@ -411,14 +434,15 @@ class DoctorRegistry:
             return {'success': False, 'message': f'Booking failed: {str(e)}'}
     
     def get_doctor_consultations(self, doctor_id: int) -> list:
-        """Get consultations for a specific doctor"""
+        """Get consultations for a specific doctor, as Consultation tuples"""
         try:
             conn = sqlite3.connect(str(self.db_path))
             cursor = conn.cursor()
             
             # Get consultations without user data first
             cursor.execute('''
-                SELECT c.*
+                SELECT c.id, c.doctor_id, c.patient_id, c.consultation_type, c.consultation_date,
+                       c.consultation_time, c.status, c.video_call_link
                 FROM consultations c
                 WHERE c.doctor_id = ?
                 ORDER BY c.consultation_date DESC, c.consultation_time DESC
@@ -439,13 +463,11 @@ class DoctorRegistry:
                     user_data = users_cursor.fetchone()
                     
                     if user_data:
-                        # Create enriched consultation tuple with patient name and email
-                        enriched_consultation = consultation + (user_data[0], user_data[1])  # Add username and email
-                        enriched_consultations.append(enriched_consultation)
+                        # Create enriched consultation with patient name and email
+                        enriched_consultations.append(Consultation(*consultation, *user_data))
                     else:
                         # If user not found, add placeholder data
-                        enriched_consultation = consultation + ("Unknown Patient", "unknown@email.com")
-                        enriched_consultations.append(enriched_consultation)
+                        enriched_consultations.append(Consultation(*consultation, "Unknown Patient", "unknown@email.com"))
                 
                 users_conn.close()
             
@@ -455,22 +477,50 @@ class DoctorRegistry:
             st.error(f"Error fetching consultations: {e}")
             return []
     
+    def get_doctor_with_stats(self, user_id: int):
+        """Get a user's doctor profile with total/pending/completed consultation counts, or None"""
+        try:
+            cursor = get_registry_connection(str(self.db_path)).cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute('''
+                SELECT d.id, d.name, d.specialization, d.years_experience, d.location, d.city,
+                       d.state, d.country, d.bio, d.qualifications, d.languages,
+                       d.consultation_hours, d.consultation_fee, d.rating, d.total_reviews,
+                       d.video_consultation, d.chat_consultation, d.emergency_contact,
+                       d.phone, d.email,
+                       COUNT(c.id) AS total_count,
+                       COALESCE(SUM(c.status = 'pending'), 0) AS pending_count,
+                       COALESCE(SUM(c.status = 'completed'), 0) AS completed_count
+                FROM doctors d
+                LEFT JOIN consultations c ON c.doctor_id = d.id
+                WHERE d.user_id = ?
+                GROUP BY d.id
+                LIMIT 1
+            ''', (user_id,))
+            return cursor.fetchone()
+            
+        except Exception as e:
+            st.error(f"Error fetching doctor profile: {e}")
+            return None
+    
     def get_patient_consultations(self, patient_id: int) -> list:
-        """Get consultations for a specific patient"""
+        """Get consultations for a specific patient, as dicts keyed by column name"""
         try:
             conn = sqlite3.connect(str(self.db_path))
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
             # Get consultations with doctor data
             cursor.execute('''
-                SELECT c.*, d.name as doctor_name, d.specialization
+                SELECT c.id, c.consultation_type, c.consultation_date, c.consultation_time,
+                       c.status, c.video_call_link, d.name AS doctor_name, d.specialization
                 FROM consultations c
                 JOIN doctors d ON c.doctor_id = d.id
                 WHERE c.patient_id = ?
                 ORDER BY c.consultation_date DESC, c.consultation_time DESC
             ''', (patient_id,))
             
-            consultations = cursor.fetchall()
+            consultations = [dict(row) for row in cursor.fetchall()]
             conn.close()
             
             return consultations
@@ -488,6 +538,7 @@ class DoctorRegistry:
             cursor.execute('UPDATE consultations SET status = ? WHERE id = ?', (status, consultation_id))
             conn.commit()
             conn.close()
+            get_patient_consultations_cached.clear()
             
             return {'success': True, 'message': 'Status updated successfully'}
             
@@ -497,38 +548,22 @@ class DoctorRegistry:
     def send_chat_message(self, consultation_id: int, sender_id: int, sender_type: str, message: str) -> dict:
         """Send a chat message"""
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            conn = get_registry_connection(str(self.db_path))
+            conn.execute('''
                 INSERT INTO chat_messages (consultation_id, sender_id, sender_type, message)
                 VALUES (?, ?, ?, ?)
             ''', (consultation_id, sender_id, sender_type, message))
             
-            conn.commit()
-            conn.close()
-            
             return {'success': True, 'message': 'Message sent successfully'}
             
         except Exception as e:
             return {'success': False, 'message': f'Failed to send message: {str(e)}'}
     
-    def get_chat_messages(self, consultation_id: int) -> list:
-        """Get chat messages for a consultation"""
+    def get_chat_messages(self, consultation_id: int, after_id: int = 0) -> list:
+        """Get chat messages for a consultation, optionally only those with id > after_id"""
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT * FROM chat_messages 
-                WHERE consultation_id = ?
-                ORDER BY created_at ASC
-            ''', (consultation_id,))
-            
-            messages = cursor.fetchall()
-            conn.close()
-            
-            return messages
+            conn = get_registry_connection(str(self.db_path))
+            return conn.execute(CHAT_MESSAGES_SQL, (consultation_id, after_id)).fetchall()
             
         except Exception as e:
             st.error(f"Error fetching chat messages: {e}")
@@ -626,10 +661,65 @@ class DoctorRegistry:
         except Exception as e:
             st.error(f"Error adding fake consultations: {e}")
 
+DOCTOR_ID_BY_USER_SQL = 'SELECT id FROM doctors WHERE user_id = ? LIMIT 1'
+IS_REGISTERED_SQL = 'SELECT 1 FROM doctors WHERE user_id = ? LIMIT 1'
+CHAT_MESSAGES_SQL = 'SELECT * FROM chat_messages WHERE consultation_id = ? AND id > ? ORDER BY created_at ASC'
+
+@st.cache_resource
+def get_registry() -> DoctorRegistry:
+    """Shared registry, so schema setup and demo-data seeding run once per process"""
+    return DoctorRegistry()
+
+@st.cache_resource
+def get_registry_connection(db_path: str) -> sqlite3.Connection:
+    """Shared connection to the doctors database, opened once per process.
+    
+    sqlite3 keeps prepared statements per connection, so reusing this connection
+    lets repeated lookups skip parsing and planning.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+@st.cache_data(ttl=300, show_spinner=False)
+def is_registered_doctor(user_id: int, db_path: str) -> bool:
+    """Check whether a user has a doctor profile (cached, cleared on registration)"""
+    conn = get_registry_connection(db_path)
+    cursor = conn.cursor()
+    cursor.execute(IS_REGISTERED_SQL, (user_id,))
+    return cursor.fetchone() is not None
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_patient_consultations_cached(_registry: DoctorRegistry, patient_id: int) -> list:
+    """Patient consultation history (cached briefly, cleared on booking and status changes)"""
+    return _registry.get_patient_consultations(patient_id)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def search_doctors(_registry: DoctorRegistry, filter_items: tuple, exclude_user_id: int = None) -> list:
+    """Doctor search results for a sorted tuple of filter items (cached, cleared on registration)"""
+    return _registry.get_doctors(dict(filter_items), exclude_user_id=exclude_user_id)
+
+def get_doctor_id(user_id: int, db_path: str):
+    """Look up the doctor id for a user, or None if they have no doctor profile"""
+    conn = get_registry_connection(db_path)
+    row = conn.execute(DOCTOR_ID_BY_USER_SQL, (user_id,)).fetchone()
+    return row[0] if row else None
+
+def confirm_consultation(consultation_id: int):
+    """Button callback: confirm a pending consultation before the rerun"""
+    result = get_registry().update_consultation_status(consultation_id, 'confirmed')
+    if result['success']:
+        st.toast("Consultation confirmed!")
+    else:
+        st.toast(result['message'])
+
+def open_consultation_chat(consultation_id: int):
+    """Button callback: open the chat for a consultation before the rerun"""
+    st.session_state.chat_consultation = consultation_id
+
 def render_doctor_registration():
     """Render doctor registration form - only for doctors"""
-    from components.login_auth import is_doctor
-    
     if not is_doctor():
         st.error("❌ Access Denied: Only doctors can register as healthcare professionals.")
         return
@@ -637,7 +727,7 @@ def render_doctor_registration():
     st.markdown("## 👨‍⚕️ Doctor Registration")
     st.markdown("Register your professional profile to help patients.")
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     with st.form("doctor_registration_form"):
         st.markdown("### Personal Information")
@@ -715,8 +805,6 @@ def render_doctor_registration():
 
 def render_doctor_search():
     """Render doctor search and listing - only for patients"""
-    from components.login_auth import is_patient
-    
     if not is_patient():
         st.error("❌ Access Denied: Only patients can search for doctors.")
         return
@@ -724,7 +812,7 @@ def render_doctor_search():
     st.markdown("## 🔍 Find a Doctor")
     st.markdown("Search for qualified healthcare professionals in your area.")
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     # Search filters
     with st.expander("🔍 Search Filters", expanded=False):
@@ -759,7 +847,7 @@ def render_doctor_search():
         filters['max_fee'] = max_fee
     
     # Get doctors
-    doctors = registry.get_doctors(filters)
+    doctors = search_doctors(registry, tuple(sorted(filters.items())))
     
     if doctors:
         st.markdown(f"### Found {len(doctors)} Doctors")
@@ -812,7 +900,7 @@ def render_doctor_details(doctor_id: int):
     """Render detailed doctor information"""
     st.markdown("## 👨‍⚕️ Doctor Details")
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     doctor_info = registry.get_doctor_details(doctor_id)
     
     if doctor_info:
@@ -896,14 +984,12 @@ def render_consultation_booking(doctor_id: int):
     """Render consultation booking form"""
     st.markdown("## 📅 Book Consultation")
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     # Get doctor info (simplified)
-    conn = sqlite3.connect(str(registry.db_path))
-    cursor = conn.cursor()
+    cursor = get_registry_connection(str(registry.db_path)).cursor()
     cursor.execute('SELECT * FROM doctors WHERE id = ?', (doctor_id,))
     doctor = cursor.fetchone()
-    conn.close()
     
     if doctor:
         doctor_data = dict(zip([col[0] for col in cursor.description], doctor))
@@ -960,8 +1046,6 @@ def render_consultation_booking(doctor_id: int):
 
 def render_doctor_dashboard():
     """Render doctor dashboard for registered doctors"""
-    from components.login_auth import is_doctor
-    
     if not is_doctor():
         st.error("❌ Access Denied: Only doctors can access this dashboard.")
         return
@@ -972,11 +1056,10 @@ def render_doctor_dashboard():
         st.error("Please log in to access the doctor dashboard.")
         return
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     # Check if user is a registered doctor
-    conn = sqlite3.connect(str(registry.db_path))
-    cursor = conn.cursor()
+    cursor = get_registry_connection(str(registry.db_path)).cursor()
     
     cursor.execute('SELECT * FROM doctors WHERE user_id = ?', (st.session_state.user_data['user_id'],))
     doctor = cursor.fetchone()
@@ -1001,11 +1084,11 @@ def render_doctor_dashboard():
         st.metric("Total Consultations", len(consultations))
     
     with col2:
-        pending_consultations = len([c for c in consultations if c[6] == 'pending'])
+        pending_consultations = len([c for c in consultations if c.status == 'pending'])
         st.metric("Pending", pending_consultations)
     
     with col3:
-        completed_consultations = len([c for c in consultations if c[6] == 'completed'])
+        completed_consultations = len([c for c in consultations if c.status == 'completed'])
         st.metric("Completed", completed_consultations)
     
     with col4:
@@ -1024,11 +1107,11 @@ def render_doctor_dashboard():
                 col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
                 
                 with col1:
-                    st.markdown(f"**Patient:** {consultation[9]}")
-                    st.markdown(f"**Type:** {consultation[3]}")
-                    st.markdown(f"**Date:** {consultation[4]} at {consultation[5]}")
-                    if consultation[8]:  # video_call_link
-                        st.markdown(f"**Video Call:** {consultation[8]}")
+                    st.markdown(f"**Patient:** {consultation.patient_name}")
+                    st.markdown(f"**Type:** {consultation.consultation_type}")
+                    st.markdown(f"**Date:** {consultation.consultation_date} at {consultation.consultation_time}")
+                    if consultation.video_call_link:
+                        st.markdown(f"**Video Call:** {consultation.video_call_link}")
                 
                 with col2:
                     status_color = {
@@ -1036,21 +1119,17 @@ def render_doctor_dashboard():
                         'confirmed': '🟢',
                         'completed': '🔵',
                         'cancelled': '🔴'
-                    }.get(consultation[6], '⚪')
-                    st.markdown(f"{status_color} {consultation[6].title()}")
+                    }.get(consultation.status, '⚪')
+                    st.markdown(f"{status_color} {consultation.status.title()}")
                 
                 with col3:
-                    if consultation[6] == 'pending':
-                        if st.button("✅ Confirm", key=f"confirm_{consultation[0]}"):
-                            result = registry.update_consultation_status(consultation[0], 'confirmed')
-                            if result['success']:
-                                st.success("Consultation confirmed!")
-                                st.rerun()
+                    if consultation.status == 'pending':
+                        st.button("✅ Confirm", key=f"confirm_{consultation.id}",
+                                  on_click=confirm_consultation, args=(consultation.id,))
                 
                 with col4:
-                    if st.button("💬 Chat", key=f"chat_{consultation[0]}"):
-                        st.session_state.chat_consultation = consultation[0]
-                        st.rerun()
+                    st.button("💬 Chat", key=f"chat_{consultation.id}",
+                              on_click=open_consultation_chat, args=(consultation.id,))
                 
                 st.divider()
     else:
@@ -1064,10 +1143,10 @@ def render_chat_interface(consultation_id: int):
     """Render chat interface for consultation"""
     st.markdown("## 💬 Consultation Chat")
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     # Get consultation details
-    conn = sqlite3.connect(str(registry.db_path))
+    conn = get_registry_connection(str(registry.db_path))
     cursor = conn.cursor()
     cursor.execute('''
         SELECT c.*, d.name as doctor_name, c.patient_id, c.video_call_link
@@ -1076,7 +1155,6 @@ def render_chat_interface(consultation_id: int):
         WHERE c.id = ?
     ''', (consultation_id,))
     consultation = cursor.fetchone()
-    conn.close()
     
     patient_name = "Unknown Patient"
     video_call_link = None
@@ -1096,14 +1174,9 @@ def render_chat_interface(consultation_id: int):
         # Video call section
         if not video_call_link:
             if st.button("🎥 Start Video Call"):
-                import secrets
                 video_call_link = f"https://meet.jit.si/heartcare-{secrets.token_urlsafe(8)}"
-                # Save the link to the consultation
-                conn = sqlite3.connect(str(registry.db_path))
-                cursor = conn.cursor()
-                cursor.execute('UPDATE consultations SET video_call_link = ? WHERE id = ?', (video_call_link, consultation_id))
-                conn.commit()
-                conn.close()
+                # Save the link to the consultation (the shared connection autocommits)
+                conn.execute('UPDATE consultations SET video_call_link = ? WHERE id = ?', (video_call_link, consultation_id))
                 st.session_state.video_call_link = video_call_link
                 st.success("Video call link generated!")
                 st.rerun()
@@ -1150,8 +1223,6 @@ def render_chat_interface(consultation_id: int):
 
 def render_patient_dashboard():
     """Render patient dashboard"""
-    from components.login_auth import is_patient
-    
     if not is_patient():
         st.error("❌ Access Denied: Only patients can access this dashboard.")
         return
@@ -1162,7 +1233,7 @@ def render_patient_dashboard():
         st.error("Please log in to access the patient dashboard.")
         return
     
-    registry = DoctorRegistry()
+    registry = get_registry()
     
     # Get patient consultations
     consultations = registry.get_patient_consultations(st.session_state.user_data['user_id'])
@@ -1174,11 +1245,11 @@ def render_patient_dashboard():
         st.metric("Total Consultations", len(consultations))
     
     with col2:
-        upcoming_consultations = len([c for c in consultations if c[6] in ['pending', 'confirmed']])
+        upcoming_consultations = len([c for c in consultations if c['status'] in ['pending', 'confirmed']])
         st.metric("Upcoming", upcoming_consultations)
     
     with col3:
-        completed_consultations = len([c for c in consultations if c[6] == 'completed'])
+        completed_consultations = len([c for c in consultations if c['status'] == 'completed'])
         st.metric("Completed", completed_consultations)
     
     # Recent consultations
@@ -1190,10 +1261,10 @@ def render_patient_dashboard():
                 col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
                 
                 with col1:
-                    st.markdown(f"**Doctor:** Dr. {consultation[9]}")
-                    st.markdown(f"**Specialization:** {consultation[10]}")
-                    st.markdown(f"**Type:** {consultation[3]}")
-                    st.markdown(f"**Date:** {consultation[4]} at {consultation[5]}")
+                    st.markdown(f"**Doctor:** Dr. {consultation['doctor_name']}")
+                    st.markdown(f"**Specialization:** {consultation['specialization']}")
+                    st.markdown(f"**Type:** {consultation['consultation_type']}")
+                    st.markdown(f"**Date:** {consultation['consultation_date']} at {consultation['consultation_time']}")
                 
                 with col2:
                     status_color = {
@@ -1201,17 +1272,16 @@ def render_patient_dashboard():
                         'confirmed': '🟢',
                         'completed': '🔵',
                         'cancelled': '🔴'
-                    }.get(consultation[6], '⚪')
-                    st.markdown(f"{status_color} {consultation[6].title()}")
+                    }.get(consultation['status'], '⚪')
+                    st.markdown(f"{status_color} {consultation['status'].title()}")
                 
                 with col3:
-                    if consultation[8]:  # video_call_link
-                        st.markdown(f"**Video Call:** {consultation[8]}")
+                    if consultation['video_call_link']:
+                        st.markdown(f"**Video Call:** {consultation['video_call_link']}")
                 
                 with col4:
-                    if st.button("💬 Chat", key=f"chat_{consultation[0]}"):
-                        st.session_state.chat_consultation = consultation[0]
-                        st.rerun()
+                    st.button("💬 Chat", key=f"chat_{consultation['id']}",
+                              on_click=open_consultation_chat, args=(consultation['id'],))
                 
                 st.divider()
     else:
@@ -25,6 +25,11 @@ try:
 except ImportError:
     CHATBOT_AVAILABLE = False
 
+@st.cache_resource
+def get_predictor():
+    """Load the prediction model once and share it across reruns and sessions"""
+    return HeartDiseasePredictor()
+
 def initialize_session_state():
     """Initialize session state variables."""
     if "patient_inputs" not in st.session_state:
@@ -696,7 +701,7 @@ def main():
         
         # Initialize predictor
         try:
-            predictor = HeartDiseasePredictor()
+            predictor = get_predictor()
         except Exception as e:
             st.error(f"❌ Error loading prediction model: {str(e)}")
             st.info("Please ensure the model files are available in the models/ directory.")
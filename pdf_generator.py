@@ -98,8 +98,20 @@ class HeartDiseaseReportGenerator:
         # Ensure reports directory exists
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         
+        self.build_report(output_path, patient_data, prediction_data)
+        
+        return output_path
+    
+    def generate_report_bytes(self, patient_data: dict, prediction_data: dict) -> bytes:
+        """Generate the assessment report in memory and return the PDF bytes"""
+        buffer = io.BytesIO()
+        self.build_report(buffer, patient_data, prediction_data)
+        return buffer.getvalue()
+    
+    def build_report(self, target, patient_data: dict, prediction_data: dict):
+        """Build the report into a file path or a writable binary file object"""
         # Create PDF document
-        doc = SimpleDocTemplate(output_path, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+        doc = SimpleDocTemplate(target, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
         
         # Build story (content)
         story = []
@@ -124,8 +136,6 @@ class HeartDiseaseReportGenerator:
         
         # Build PDF
         doc.build(story)
-        
-        return output_path
     
     def create_header(self):
         """Create the report header"""
@@ -381,6 +391,16 @@ def generate_heart_disease_report(patient_data: dict, prediction_data: dict) ->
     generator = HeartDiseaseReportGenerator()
     return generator.generate_report(patient_data, prediction_data)
 
+def generate_heart_disease_report_bytes(patient_data: dict, prediction_data: dict) -> bytes:
+    """Generate a heart disease assessment report as PDF bytes"""
+    generator = HeartDiseaseReportGenerator()
+    return generator.generate_report_bytes(patient_data, prediction_data)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_report_pdf(patient_data: dict, prediction_data: dict) -> bytes:
+    """PDF bytes for an assessment (cached, so reruns reuse the rendered report)"""
+    return generate_heart_disease_report_bytes(patient_data, prediction_data)
+
 def render_pdf_generator():
     """Render PDF generator interface"""
     st.markdown("## 📄 Generate Report")
@@ -401,33 +421,27 @@ def render_pdf_generator():
             st.markdown(f"- Prediction: {'Heart Disease Risk' if prediction_data.get('prediction') == 1 else 'No Risk'}")
         
         with col2:
-            if st.button("📄 Generate PDF Report", type="primary"):
-                with st.spinner("Generating PDF report..."):
-                    try:
-                        # Generate report
-                        report_path = generate_heart_disease_report(
-                            prediction_data.get('input_data', {}),
-                            prediction_data
-                        )
-                        
-                        # Read the generated PDF
-                        with open(report_path, "rb") as pdf_file:
-                            pdf_bytes = pdf_file.read()
-                        
-                        # Provide download button
-                        st.success("✅ PDF report generated successfully!")
-                        st.download_button(
-                            label="📥 Download Report",
-                            data=pdf_bytes,
-                            file_name=f"heart_disease_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                            mime="application/pdf"
-                        )
-                        
-                        # Show preview info
-                        st.info("📋 Report includes: Patient information, assessment results, detailed analysis, recommendations, and medical disclaimer.")
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error generating report: {str(e)}")
+            with st.spinner("Generating PDF report..."):
+                try:
+                    pdf_bytes = get_report_pdf(
+                        prediction_data.get('input_data', {}),
+                        prediction_data
+                    )
+                    
+                    # Provide download button
+                    st.download_button(
+                        label="📥 Download Report",
+                        data=pdf_bytes,
+                        file_name=f"heart_disease_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                        mime="application/pdf",
+                        type="primary"
+                    )
+                    
+                    # Show preview info
+                    st.info("📋 Report includes: Patient information, assessment results, detailed analysis, recommendations, and medical disclaimer.")
+                    
+                except Exception as e:
+                    st.error(f"❌ Error generating report: {str(e)}")
     else:
         st.info("📋 No recent assessment data found. Please complete a heart disease assessment first.")
         if st.button("🔍 Go to Assessment"):
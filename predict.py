@@ -5,17 +5,39 @@ import warnings
 from pathlib import Path
 from typing import Tuple, Dict, Union, List
 import logging
+from sklearn.preprocessing import StandardScaler
+from functools import lru_cache
+from contextlib import nullcontext
+from joblib import parallel_backend
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _load_artifact(path: str):
+    """
+    Unpickle a model artifact once per process.
+    
+    Every HeartDiseasePredictor (the app, patient mode and doctor mode each keep
+    their own) shares the same read-only model and scaler objects.
+    """
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
 class HeartDiseasePredictor:
     """
     A comprehensive heart disease prediction class that loads trained models
     and provides prediction functionality with input validation and risk assessment.
     """
     
+    # Upper probability bounds of each risk band, and the band names in order
+    RISK_THRESHOLDS = (0.2, 0.5, 0.8)
+    RISK_LEVELS = ("Low Risk", "Moderate Risk", "High Risk", "Very High Risk")
+    
+    # Batches at least this large are predicted on all CPU cores
+    PARALLEL_MIN_ROWS = 10_000
+    
     def __init__(self, model_path: str = None, scaler_path: str = None):
         """
         Initialize the HeartDiseasePredictor with trained model and scaler.
@@ -26,6 +48,7 @@ class HeartDiseasePredictor:
         """
         self.model = None
         self.scaler = None
+        self._scale_params = None
         self.feature_names = [
             "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
             "thalach", "exang", "oldpeak", "slope", "ca", "thal"
@@ -52,15 +75,19 @@ class HeartDiseasePredictor:
         """
         try:
             # Load the model
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            self.model = _load_artifact(str(Path(model_path).resolve()))
             logger.info(f"Model loaded successfully from {model_path}")
             
             # Load the scaler
-            with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
+            self.scaler = _load_artifact(str(Path(scaler_path).resolve()))
             logger.info(f"Scaler loaded successfully from {scaler_path}")
             
+            # A plain StandardScaler is applied directly as (x - mean) / scale
+            if isinstance(self.scaler, StandardScaler):
+                mean = self.scaler.mean_ if self.scaler.with_mean else 0.0
+                scale = self.scaler.scale_ if self.scaler.with_std else 1.0
+                self._scale_params = (mean, scale)
+            
             return True
             
         except FileNotFoundError as e:
@@ -89,8 +116,11 @@ class HeartDiseasePredictor:
                     logger.error(f"Missing features: {missing_features}")
                     return None, False
                 
-                # Convert to array in correct order
-                input_array = np.array([input_data[feature] for feature in self.feature_names])
+                # Fill one float row in feature order, without an intermediate list
+                input_array = np.fromiter(
+                    (input_data[feature] for feature in self.feature_names),
+                    dtype=np.float64, count=len(self.feature_names)
+                ).reshape(1, -1)
             
             # Convert list to array if needed
             elif isinstance(input_data, list):
@@ -146,28 +176,70 @@ class HeartDiseasePredictor:
         
         try:
             # Scale the input
-            input_scaled = self.scaler.transform(input_array)
+            input_scaled = self._scale(input_array)
             
             # Make prediction
-            prediction = self.model.predict(input_scaled)[0]
-            
-            # Get probability
-            if hasattr(self.model, 'predict_proba'):
-                probability = self.model.predict_proba(input_scaled)[0][1]  # Probability of class 1
-            else:
-                # For models without predict_proba, use decision function
-                if hasattr(self.model, 'decision_function'):
-                    decision_score = self.model.decision_function(input_scaled)[0]
-                    probability = 1 / (1 + np.exp(-decision_score))  # Sigmoid transformation
-                else:
-                    probability = 1.0 if prediction == 1 else 0.0
+            predictions, probabilities = self._predict_scaled(input_scaled)
             
-            return int(prediction), float(probability)
+            return int(predictions[0]), float(probabilities[0])
             
         except Exception as e:
             logger.error(f"Error making prediction: {e}")
             return None, None
     
+    def _scale(self, input_array: np.ndarray) -> np.ndarray:
+        """
+        Scale input features the way the fitted scaler does.
+        
+        For a StandardScaler this is the same arithmetic as scaler.transform, but
+        without sklearn's per-call validation and copies, which dominate the cost
+        for single-row predictions.
+        
+        Args:
+            input_array: Input features, one row per sample
+            
+        Returns:
+            np.ndarray: Scaled features
+        """
+        if self._scale_params is None:
+            return self.scaler.transform(input_array)
+        mean, scale = self._scale_params
+        return (input_array - mean) / scale
+    
+    def _predict_scaled(self, input_scaled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run the model on scaled input.
+        
+        Classifiers with predict_proba are evaluated once: the predicted class is
+        the most probable one, which is what their predict() computes internally,
+        so the ensemble is not traversed a second time.
+        
+        Args:
+            input_scaled: Scaled input features, one row per sample
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (predictions, probabilities of class 1)
+        """
+        # sklearn's tree ensembles compare features in float32 and would otherwise
+        # make their own float32 copy of the input on every call
+        if hasattr(self.model, 'estimators_') or hasattr(self.model, 'tree_'):
+            input_scaled = np.ascontiguousarray(input_scaled, dtype=np.float32)
+        
+        if hasattr(self.model, 'predict_proba'):
+            proba = self.model.predict_proba(input_scaled)
+            predictions = self.model.classes_.take(np.argmax(proba, axis=1))
+            probabilities = proba[:, 1]  # Probability of class 1
+        else:
+            predictions = self.model.predict(input_scaled)
+            # For models without predict_proba, use decision function
+            if hasattr(self.model, 'decision_function'):
+                decision_scores = self.model.decision_function(input_scaled)
+                probabilities = 1 / (1 + np.exp(-decision_scores))  # Sigmoid transformation
+            else:
+                probabilities = (predictions == 1).astype(float)
+        
+        return predictions, probabilities
+    
     def predict_batch(self, input_data: Union[np.ndarray, List[List], List[Dict]]) -> Tuple[List[int], List[float]]:
         """
         Predict heart disease for multiple samples.
@@ -200,20 +272,18 @@ class HeartDiseasePredictor:
                 return None, None
             
             # Scale the input
-            input_scaled = self.scaler.transform(input_array)
+            input_scaled = self._scale(input_array)
             
-            # Make predictions
-            predictions = self.model.predict(input_scaled)
-            
-            # Get probabilities
-            if hasattr(self.model, 'predict_proba'):
-                probabilities = self.model.predict_proba(input_scaled)[:, 1]  # Probability of class 1
+            # Large batches run the model on all cores; estimators that leave n_jobs
+            # unset (the RandomForest default) pick up the backend's n_jobs
+            if len(input_scaled) >= self.PARALLEL_MIN_ROWS:
+                backend = parallel_backend('threading', n_jobs=-1)
             else:
-                if hasattr(self.model, 'decision_function'):
-                    decision_scores = self.model.decision_function(input_scaled)
-                    probabilities = 1 / (1 + np.exp(-decision_scores))  # Sigmoid transformation
-                else:
-                    probabilities = [1.0 if pred == 1 else 0.0 for pred in predictions]
+                backend = nullcontext()
+            
+            with backend:
+                # Make predictions
+                predictions, probabilities = self._predict_scaled(input_scaled)
             
             return predictions.tolist(), probabilities.tolist()
             
@@ -231,14 +301,23 @@ class HeartDiseasePredictor:
         Returns:
             str: Risk level description
         """
-        if probability < 0.2:
-            return "Low Risk"
-        elif probability < 0.5:
-            return "Moderate Risk"
-        elif probability < 0.8:
-            return "High Risk"
-        else:
-            return "Very High Risk"
+        for threshold, level in zip(self.RISK_THRESHOLDS, self.RISK_LEVELS):
+            if probability < threshold:
+                return level
+        return self.RISK_LEVELS[-1]
+    
+    def get_risk_levels(self, probabilities: Union[np.ndarray, List[float]]) -> np.ndarray:
+        """
+        Convert an array of probabilities to risk levels in one pass.
+        
+        Args:
+            probabilities: Probabilities of heart disease
+            
+        Returns:
+            np.ndarray: Risk level descriptions (same bands as get_risk_level)
+        """
+        bands = np.searchsorted(self.RISK_THRESHOLDS, np.asarray(probabilities, dtype=float), side='right')
+        return np.asarray(self.RISK_LEVELS)[bands]
     
     def get_feature_importance(self) -> Dict[str, float]:
         """
@@ -294,6 +373,11 @@ class HeartDiseasePredictor:
         
         return explanation
 
+@lru_cache(maxsize=1)
+def _default_predictor() -> HeartDiseasePredictor:
+    """Predictor with the default model and scaler, loaded on first use."""
+    return HeartDiseasePredictor()
+
 # Convenience function for simple predictions
 def predict_heart_disease(input_data: Union[np.ndarray, List, Dict]) -> Tuple[int, float]:
     """
@@ -305,8 +389,7 @@ def predict_heart_disease(input_data: Union[np.ndarray, List, Dict]) -> Tuple[in
     Returns:
         Tuple[int, float]: (prediction, probability)
     """
-    predictor = HeartDiseasePredictor()
-    return predictor.predict_heart_disease(input_data)
+    return _default_predictor().predict_heart_disease(input_data)
 
 # Example usage and testing
 if __name__ == "__main__":